@@ -0,0 +1,224 @@
+import asyncio
+import contextlib
+import hashlib
+import io
+import os
+import threading
+from typing import NamedTuple
+from urllib.parse import quote, urlsplit
+import httpx
+from PIL import Image, ImageOps, UnidentifiedImageError
+from reflex.config import get_config
+from app.api.single_flight import flights
+
+AVATAR_CACHE_DIR = os.getenv("PCO_AVATAR_CACHE_DIR", "avatar_cache")
+AVATAR_SIZE = int(os.getenv("PCO_AVATAR_SIZE", "64"))
+AVATAR_HOSTS = tuple(
+    host.strip()
+    for host in os.getenv("PCO_AVATAR_HOSTS", "planningcenteronline.com").split(",")
+    if host.strip()
+)
+AVATAR_TIMEOUT = float(os.getenv("PCO_AVATAR_TIMEOUT", "10"))
+AVATAR_MAX_BYTES = int(os.getenv("PCO_AVATAR_MAX_BYTES", str(2 * 1024 * 1024)))
+AVATAR_MAX_REDIRECTS = 5
+AVATAR_CACHE_MAX_BYTES = int(
+    os.getenv("PCO_AVATAR_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+)
+AVATAR_ROUTE = "/api/avatar"
+SVG_MEDIA_TYPE = "image/svg+xml"
+
+
+class AvatarError(Exception):
+    """An avatar that cannot be served: too large, not an image, or off-host."""
+
+
+class Thumbnail(NamedTuple):
+    digest: str
+    media_type: str
+    path: str
+
+
+def avatar_url(source_url: str) -> str:
+    """Return the backend URL serving an avatar's thumbnail.
+
+    Avatars on hosts outside ``PCO_AVATAR_HOSTS`` are returned unchanged.
+    """
+    if not is_allowed(source_url):
+        return source_url
+    return f"{get_config().api_url}{AVATAR_ROUTE}?url={quote(source_url, safe='')}"
+
+
+def is_allowed(source_url: str) -> bool:
+    """Whether an avatar URL is on one of ``PCO_AVATAR_HOSTS`` or a subdomain."""
+    parts = urlsplit(source_url)
+    host = parts.hostname or ""
+    return parts.scheme in ("http", "https") and any(
+        host == allowed or host.endswith(f".{allowed}") for allowed in AVATAR_HOSTS
+    )
+
+
+def _make_thumbnail(data: bytes, media_type: str) -> tuple[bytes, str]:
+    """Center-crop and shrink an image to ``AVATAR_SIZE`` square.
+
+    SVGs, such as the default avatars, are kept as they are; any other body
+    Pillow cannot decode, and decompression bombs, raise ``AvatarError``.
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image = ImageOps.exif_transpose(image)
+            thumbnail = ImageOps.fit(
+                image.convert("RGBA"), (AVATAR_SIZE, AVATAR_SIZE), Image.LANCZOS
+            )
+    except Image.DecompressionBombError as e:
+        raise AvatarError(f"Avatar image is too large: {e}") from e
+    except (UnidentifiedImageError, OSError) as e:
+        if media_type == SVG_MEDIA_TYPE:
+            return data, media_type
+        raise AvatarError(f"Avatar is not a decodable image: {e}") from e
+    output = io.BytesIO()
+    thumbnail.save(output, format="WEBP", quality=80)
+    return output.getvalue(), "image/webp"
+
+
+async def _read_image(response: httpx.Response) -> tuple[bytes, str]:
+    """Read an image body of at most ``AVATAR_MAX_BYTES`` and its media type."""
+    response.raise_for_status()
+    media_type = response.headers.get("Content-Type", "").split(";")[0]
+    media_type = media_type.strip().lower()
+    if not media_type.startswith("image/"):
+        raise AvatarError(f"Avatar has non-image type {media_type!r}")
+    if int(response.headers.get("Content-Length") or 0) > AVATAR_MAX_BYTES:
+        raise AvatarError("Avatar exceeds PCO_AVATAR_MAX_BYTES")
+    chunks = []
+    size = 0
+    async for chunk in response.aiter_bytes():
+        size += len(chunk)
+        if size > AVATAR_MAX_BYTES:
+            raise AvatarError("Avatar exceeds PCO_AVATAR_MAX_BYTES")
+        chunks.append(chunk)
+    return b"".join(chunks), media_type
+
+
+class AvatarCache:
+    """Content-addressed disk cache of avatar thumbnails.
+
+    Thumbnails are stored once under the SHA-256 of their bytes, which also
+    serves as their ETag; a small index file per source URL points at the
+    thumbnail, so each avatar is downloaded and resized only once. Once the
+    directory holds more than ``max_bytes`` the oldest files are removed.
+    """
+
+    def __init__(
+        self, directory: str = AVATAR_CACHE_DIR, max_bytes: int = AVATAR_CACHE_MAX_BYTES
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._client: httpx.AsyncClient | None = None
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(directory, "urls"), exist_ok=True)
+        self.size = sum(size for _, _, size in self._files())
+
+    def _files(self) -> list[tuple[float, str, int]]:
+        """Return ``(mtime, path, size)`` of every stored thumbnail and index file."""
+        files = []
+        for directory in (self.directory, os.path.join(self.directory, "urls")):
+            for entry in os.scandir(directory):
+                if entry.is_file() and not entry.name.endswith(".tmp"):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, entry.path, stat.st_size))
+        return files
+
+    def _write(self, path: str, data: bytes):
+        previous = os.path.getsize(path) if os.path.exists(path) else 0
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as output:
+            output.write(data)
+        os.replace(temporary, path)
+        self.size += len(data) - previous
+
+    def _prune(self):
+        if self.size <= self.max_bytes:
+            return
+        for _, path, size in sorted(self._files()):
+            if self.size <= self.max_bytes:
+                return
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+                self.size -= size
+
+    def _index_path(self, source_url: str) -> str:
+        key = hashlib.sha256(source_url.encode()).hexdigest()
+        return os.path.join(self.directory, "urls", key)
+
+    def _lookup(self, source_url: str) -> Thumbnail | None:
+        try:
+            with open(self._index_path(source_url)) as index:
+                digest, media_type = index.read().split()
+        except (FileNotFoundError, ValueError):
+            return None
+        path = os.path.join(self.directory, digest)
+        if not media_type.startswith("image/") or not os.path.exists(path):
+            return None
+        return Thumbnail(digest, media_type, path)
+
+    def _store(self, source_url: str, data: bytes, media_type: str) -> Thumbnail:
+        data, media_type = _make_thumbnail(data, media_type)
+        digest = hashlib.sha256(data).hexdigest()
+        path = os.path.join(self.directory, digest)
+        with self._lock:
+            if not os.path.exists(path):
+                self._write(path, data)
+            self._write(self._index_path(source_url), f"{digest} {media_type}".encode())
+            self._prune()
+        return Thumbnail(digest, media_type, path)
+
+    async def get(self, source_url: str) -> Thumbnail:
+        """Return the thumbnail of an avatar, downloading it on first use."""
+        thumbnail = await asyncio.to_thread(self._lookup, source_url)
+        if thumbnail is not None:
+            return thumbnail
+        return await flights.do(
+            ("avatars", source_url, ""), lambda: self._fetch(source_url)
+        )
+
+    async def _fetch(self, source_url: str) -> Thumbnail:
+        """Download an avatar, checking every redirect target before requesting it."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=AVATAR_TIMEOUT)
+        url = httpx.URL(source_url)
+        for _ in range(AVATAR_MAX_REDIRECTS + 1):
+            if not is_allowed(str(url)):
+                raise AvatarError(f"Avatar redirected off-host to {url}")
+            async with self._client.stream("GET", url) as response:
+                if response.next_request is None:
+                    data, media_type = await _read_image(response)
+                    return await asyncio.to_thread(
+                        self._store, source_url, data, media_type
+                    )
+                url = response.next_request.url
+        raise AvatarError("Avatar redirected too many times")
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+
+
+_cache: AvatarCache | None = None
+
+
+def get_avatar_cache() -> AvatarCache:
+    """Return the process-wide avatar cache, creating its directory on first use."""
+    global _cache
+    if _cache is None:
+        _cache = AvatarCache()
+    return _cache
+
+
+@contextlib.asynccontextmanager
+async def avatar_cache_lifespan():
+    """Lifespan task that closes the avatar download client on shutdown."""
+    try:
+        yield
+    finally:
+        if _cache is not None:
+            await _cache.aclose()
@@ -0,0 +1,225 @@
+import asyncio
+import contextlib
+import importlib.util
+import logging
+import os
+import weakref
+from collections import OrderedDict
+from typing import AsyncIterator, TypedDict
+import httpx
+import reflex as rx
+from app.api.http_cache import CachingTransport, get_http_cache
+from app.api.instrumentation import record_response
+from app.api.prometheus import record_api_response
+from app.api.rate_limit import RateLimitedTransport
+from app.api.single_flight import flights
+from app.states.auth_state import API_BASE_URL
+
+MAX_CONNECTIONS = int(os.getenv("PCO_MAX_CONNECTIONS", "20"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("PCO_MAX_KEEPALIVE_CONNECTIONS", "10"))
+KEEPALIVE_EXPIRY = float(os.getenv("PCO_KEEPALIVE_EXPIRY", "30"))
+REQUEST_TIMEOUT = float(os.getenv("PCO_REQUEST_TIMEOUT", "30"))
+MAX_CLIENTS = int(os.getenv("PCO_MAX_CLIENTS", "64"))
+HTTP2_REQUESTED = os.getenv("PCO_HTTP2", "0") == "1"
+
+
+class PoolStats(TypedDict):
+    clients: int
+    connections: int
+    active_connections: int
+    idle_connections: int
+    requests: int
+    bytes_received: int
+    throttled_requests: int
+    cache_hits: int
+    cache_misses: int
+    cache_entries: int
+    cache_bytes: int
+    fetches_started: int
+    fetches_coalesced: int
+    fetches_in_flight: int
+    max_connections: int
+    max_keepalive_connections: int
+    http2: bool
+
+
+def _http2_enabled() -> bool:
+    if HTTP2_REQUESTED and importlib.util.find_spec("h2") is None:
+        logging.warning("PCO_HTTP2 is set but the h2 package is not installed.")
+        return False
+    return HTTP2_REQUESTED
+
+
+HTTP2_ENABLED = _http2_enabled()
+
+
+class PooledClient:
+    """A long-lived ``httpx.AsyncClient`` for one access token.
+
+    Requests pass through a ``RateLimitedTransport`` so that everything sent
+    with the token shares a single rate-limit budget, and GETs are revalidated
+    against the shared HTTP cache by a ``CachingTransport`` on top of it.
+    """
+
+    def __init__(self, token: str):
+        self.leases = 0
+        self.requests = 0
+        self.bytes_received = 0
+        self.transport = httpx.AsyncHTTPTransport(
+            http2=HTTP2_ENABLED,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+        )
+        self.rate_limiter = RateLimitedTransport(self.transport)
+        self.client = httpx.AsyncClient(
+            headers={"Authorization": f"Bearer {token}"},
+            transport=CachingTransport(self.rate_limiter, get_http_cache()),
+            timeout=REQUEST_TIMEOUT,
+            event_hooks={
+                "request": [self._count_request],
+                "response": [self._record_response],
+            },
+        )
+
+    async def _count_request(self, request: httpx.Request):
+        self.requests += 1
+
+    async def _record_response(self, response: httpx.Response):
+        """Count a response's bytes for the pool, sync stages and ``/metrics``.
+
+        Bodies served from the HTTP cache after a ``304`` count as zero bytes.
+        """
+        await response.aread()
+        cache_hit = bool(response.extensions.get("pco_cache_hit"))
+        downloaded = 0 if cache_hit else response.num_bytes_downloaded
+        self.bytes_received += downloaded
+        record_response(downloaded)
+        record_api_response(response, downloaded, cache_hit)
+
+    def connection_counts(self) -> tuple[int, int]:
+        """Return ``(active, idle)`` connection counts for this client's pool."""
+        pool = getattr(self.transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return len(connections) - idle, idle
+
+
+_clients: OrderedDict[str, PooledClient] = OrderedDict()
+_organization_ids: weakref.WeakKeyDictionary[httpx.AsyncClient, str] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _evict_idle_clients(keep: str):
+    for token, pooled in list(_clients.items()):
+        if len(_clients) <= MAX_CLIENTS:
+            return
+        active, _ = pooled.connection_counts()
+        if active == 0 and not pooled.leases and token != keep:
+            del _clients[token]
+            asyncio.ensure_future(pooled.client.aclose())
+
+
+def get_client(token: str) -> httpx.AsyncClient:
+    """Return the shared pooled client for an access token, creating it if needed.
+
+    The client is owned by this module and must not be closed by callers.
+    """
+    pooled = _clients.get(token)
+    if pooled is None or pooled.client.is_closed:
+        pooled = _clients[token] = PooledClient(token)
+        _evict_idle_clients(keep=token)
+    _clients.move_to_end(token)
+    return pooled.client
+
+
+@contextlib.asynccontextmanager
+async def leased_client(token: str) -> AsyncIterator[httpx.AsyncClient]:
+    """Yield the pooled client for a token, which is not evicted until released."""
+    client = get_client(token)
+    pooled = _clients[token]
+    pooled.leases += 1
+    try:
+        yield client
+    finally:
+        pooled.leases -= 1
+
+
+async def get_access_token(state: rx.State) -> str | None:
+    """Return the access token of the signed-in user of a background event."""
+    from app.states.auth_state import AuthState
+
+    async with state:
+        auth_state = await state.get_state(AuthState)
+        if not auth_state.is_authenticated or not auth_state.access_token:
+            return None
+        return auth_state.access_token
+
+
+async def get_authed_client(state: rx.State) -> httpx.AsyncClient | None:
+    """Return the pooled client for the signed-in user of a background event."""
+    token = await get_access_token(state)
+    return None if token is None else get_client(token)
+
+
+async def get_organization_id(client: httpx.AsyncClient) -> str:
+    """Return the id of the organization a client's access token belongs to."""
+    organization_id = _organization_ids.get(client)
+    if organization_id is None:
+        response = await client.get(f"{API_BASE_URL}/people/v2")
+        response.raise_for_status()
+        organization_id = response.json()["data"]["id"]
+        _organization_ids[client] = organization_id
+    return organization_id
+
+
+def pool_stats() -> PoolStats:
+    """Return connection pool and coalesced fetch statistics across all clients."""
+    active = idle = requests = bytes_received = throttled = 0
+    for pooled in _clients.values():
+        client_active, client_idle = pooled.connection_counts()
+        active += client_active
+        idle += client_idle
+        requests += pooled.requests
+        bytes_received += pooled.bytes_received
+        throttled += pooled.rate_limiter.throttled
+    cache = get_http_cache()
+    return {
+        "clients": len(_clients),
+        "connections": active + idle,
+        "active_connections": active,
+        "idle_connections": idle,
+        "requests": requests,
+        "bytes_received": bytes_received,
+        "throttled_requests": throttled,
+        "cache_hits": cache.hits,
+        "cache_misses": cache.misses,
+        "cache_entries": cache.entries,
+        "cache_bytes": cache.size,
+        "fetches_started": flights.started,
+        "fetches_coalesced": flights.coalesced,
+        "fetches_in_flight": flights.in_flight(),
+        "max_connections": MAX_CONNECTIONS,
+        "max_keepalive_connections": MAX_KEEPALIVE_CONNECTIONS,
+        "http2": HTTP2_ENABLED,
+    }
+
+
+async def close_all_clients():
+    """Close every pooled client."""
+    pooled_clients = list(_clients.values())
+    _clients.clear()
+    for pooled in pooled_clients:
+        await pooled.client.aclose()
+
+
+@contextlib.asynccontextmanager
+async def client_pool_lifespan():
+    """Lifespan task that closes pooled clients when the backend shuts down."""
+    try:
+        yield
+    finally:
+        await close_all_clients()
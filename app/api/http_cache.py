@@ -0,0 +1,199 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import TypedDict
+import httpx
+
+HTTP_CACHE_DB_PATH = os.getenv("PCO_HTTP_CACHE_DB", "pco_http_cache.db")
+HTTP_CACHE_MAX_BYTES = int(os.getenv("PCO_HTTP_CACHE_MAX_BYTES", "268435456"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    etag TEXT NOT NULL,
+    last_modified TEXT NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+
+class CachedResponse(TypedDict):
+    etag: str
+    last_modified: str
+    headers: list[tuple[str, str]]
+    body: bytes
+
+
+class HttpCache:
+    """Size-bounded SQLite store of response bodies and their validators.
+
+    Entries are evicted least recently used first once their bodies exceed
+    ``max_bytes`` in total. Calls are synchronous and serialized on one
+    connection; run them with ``asyncio.to_thread`` from async code.
+    """
+
+    def __init__(
+        self, path: str = HTTP_CACHE_DB_PATH, max_bytes: int = HTTP_CACHE_MAX_BYTES
+    ):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            row = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        self.entries, self.size = row[0], row[1]
+
+    def get(self, key: str) -> CachedResponse | None:
+        """Return the stored response for a key and mark it recently used."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, headers, body FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+        return {
+            "etag": row["etag"],
+            "last_modified": row["last_modified"],
+            "headers": [tuple(header) for header in json.loads(row["headers"])],
+            "body": row["body"],
+        }
+
+    def put(self, key: str, response: CachedResponse):
+        """Store a response, evicting the least recently used ones to make room."""
+        size = len(response["body"])
+        if size > self.max_bytes:
+            return
+        with self._lock, self._conn:
+            self._delete(key)
+            self._conn.execute(
+                "INSERT INTO responses (key, etag, last_modified, headers, body, size, accessed) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    response["etag"],
+                    response["last_modified"],
+                    json.dumps(response["headers"]),
+                    response["body"],
+                    size,
+                    time.time(),
+                ),
+            )
+            self.entries += 1
+            self.size += size
+            while self.size > self.max_bytes:
+                row = self._conn.execute(
+                    "SELECT key FROM responses ORDER BY accessed LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    break
+                self._delete(row["key"])
+
+    def _delete(self, key: str):
+        row = self._conn.execute(
+            "SELECT size FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.entries -= 1
+            self.size -= row["size"]
+
+
+def cache_key(request: httpx.Request) -> str:
+    """Key a request by its URL and credentials, so users never share entries."""
+    identity = f"{request.headers.get('Authorization', '')}\n{request.url}"
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """Transport that revalidates cached GET responses with conditional requests.
+
+    A GET with a stored response is sent with ``If-None-Match`` and
+    ``If-Modified-Since``; on ``304 Not Modified`` the stored body is returned
+    as a 200. Fresh 200 responses that carry an ``ETag`` or ``Last-Modified``
+    are stored for the next request. Bodies are handed back as unread streams,
+    so the client reads them and counts their bytes; cache hits are marked
+    with the ``pco_cache_hit`` extension.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, cache: HttpCache):
+        self.transport = transport
+        self.cache = cache
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return await self.transport.handle_async_request(request)
+        key = cache_key(request)
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            if cached["etag"]:
+                request.headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                request.headers["If-Modified-Since"] = cached["last_modified"]
+        response = await self.transport.handle_async_request(request)
+        if response.status_code == 304 and cached is not None:
+            self.cache.hits += 1
+            await response.aclose()
+            return httpx.Response(
+                200,
+                headers=cached["headers"],
+                stream=httpx.ByteStream(cached["body"]),
+                request=request,
+                extensions={**response.extensions, "pco_cache_hit": True},
+            )
+        self.cache.misses += 1
+        etag = response.headers.get("ETag", "")
+        last_modified = response.headers.get("Last-Modified", "")
+        if response.status_code != 200 or not (etag or last_modified):
+            return response
+        body = b"".join([chunk async for chunk in response.aiter_raw()])
+        await response.aclose()
+        headers = response.headers.multi_items()
+        await asyncio.to_thread(
+            self.cache.put,
+            key,
+            {
+                "etag": etag,
+                "last_modified": last_modified,
+                "headers": headers,
+                "body": body,
+            },
+        )
+        return httpx.Response(
+            200,
+            headers=headers,
+            stream=httpx.ByteStream(body),
+            request=request,
+            extensions=response.extensions,
+        )
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+_cache: HttpCache | None = None
+
+
+def get_http_cache() -> HttpCache:
+    """Return the process-wide response cache, opening it on first use."""
+    global _cache
+    if _cache is None:
+        _cache = HttpCache()
+    return _cache
@@ -0,0 +1,37 @@
+import contextlib
+from contextvars import ContextVar
+from typing import Iterator
+
+
+class RequestStats:
+    """Requests and bytes received while a ``track_requests`` block is active."""
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes = 0
+
+
+_active_stats: ContextVar[tuple[RequestStats, ...]] = ContextVar(
+    "pco_request_stats", default=()
+)
+
+
+@contextlib.contextmanager
+def track_requests() -> Iterator[RequestStats]:
+    """Count the API requests made by this task and the tasks it starts.
+
+    Blocks nest: a request counts towards every enclosing block.
+    """
+    stats = RequestStats()
+    token = _active_stats.set((*_active_stats.get(), stats))
+    try:
+        yield stats
+    finally:
+        _active_stats.reset(token)
+
+
+def record_response(downloaded: int):
+    """Credit a response of ``downloaded`` bytes to the active ``track_requests`` blocks."""
+    for stats in _active_stats.get():
+        stats.requests += 1
+        stats.bytes += downloaded
@@ -0,0 +1,140 @@
+import asyncio
+import os
+from typing import AsyncIterator
+import httpx
+from app.api.prometheus import API_PAGES, api_resource
+
+PER_PAGE = 100
+PAGE_CONCURRENCY = int(os.getenv("PCO_PAGE_CONCURRENCY", "8"))
+
+
+async def _get_page(
+    client: httpx.AsyncClient, url: str, params: dict[str, str | int]
+) -> dict:
+    response = await client.get(url, params=params)
+    response.raise_for_status()
+    return response.json()
+
+
+async def iter_pages(
+    client: httpx.AsyncClient,
+    url: str,
+    params: dict[str, str | int] | None = None,
+    *,
+    per_page: int = PER_PAGE,
+    concurrency: int = PAGE_CONCURRENCY,
+) -> AsyncIterator[dict]:
+    """Yield every page of a collection in order, fetching ahead concurrently.
+
+    The first page is fetched on its own to read ``meta.total_count``; the
+    remaining ``offset`` pages are then requested at most ``concurrency`` at a
+    time. Collections that do not report a total fall back to following
+    ``links.next`` serially.
+    """
+    params = {**(params or {}), "per_page": per_page}
+    first_page = await _get_page(client, url, {**params, "offset": 0})
+    yield first_page
+    total_count = first_page.get("meta", {}).get("total_count")
+    if total_count is None:
+        pages = 1
+        next_url = first_page.get("links", {}).get("next")
+        while next_url:
+            page = await _get_page(client, next_url, {})
+            yield page
+            pages += 1
+            next_url = page.get("links", {}).get("next")
+        API_PAGES.observe(pages, resource=api_resource(url))
+        return
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch(offset: int) -> dict:
+        async with semaphore:
+            return await _get_page(client, url, {**params, "offset": offset})
+
+    tasks = [
+        asyncio.create_task(fetch(offset))
+        for offset in range(per_page, total_count, per_page)
+    ]
+    try:
+        for task in tasks:
+            yield await task
+        API_PAGES.observe(len(tasks) + 1, resource=api_resource(url))
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def fetch_all_pages(
+    client: httpx.AsyncClient,
+    url: str,
+    params: dict[str, str | int] | None = None,
+    *,
+    per_page: int = PER_PAGE,
+    concurrency: int = PAGE_CONCURRENCY,
+) -> list[dict]:
+    """Fetch every page of a collection and return the page bodies in order."""
+    return [
+        page
+        async for page in iter_pages(
+            client, url, params, per_page=per_page, concurrency=concurrency
+        )
+    ]
+
+
+async def iter_records(
+    client: httpx.AsyncClient,
+    url: str,
+    params: dict[str, str | int] | None = None,
+    *,
+    per_page: int = PER_PAGE,
+    concurrency: int = PAGE_CONCURRENCY,
+) -> AsyncIterator[tuple[list[dict], int | None]]:
+    """Yield each page's new records, in order, with the collection's total count.
+
+    Records already yielded on an earlier page are skipped, as in
+    ``page_records``.
+    """
+    seen = set()
+    async for page in iter_pages(
+        client, url, params, per_page=per_page, concurrency=concurrency
+    ):
+        records = []
+        for item in page.get("data", []):
+            identity = (item.get("type"), item.get("id"))
+            if identity not in seen:
+                seen.add(identity)
+                records.append(item)
+        yield records, page.get("meta", {}).get("total_count")
+
+
+def page_records(pages: list[dict], key: str = "data") -> list[dict]:
+    """Flatten the ``data`` (or ``included``) arrays of pages, dropping repeats.
+
+    Records can shift between offset pages when the collection changes during
+    a pull, so a record already seen on an earlier page is skipped.
+    """
+    seen = set()
+    records = []
+    for page in pages:
+        for item in page.get(key, []):
+            identity = (item.get("type"), item.get("id"))
+            if identity in seen:
+                continue
+            seen.add(identity)
+            records.append(item)
+    return records
+
+
+async def fetch_all_records(
+    client: httpx.AsyncClient,
+    url: str,
+    params: dict[str, str | int] | None = None,
+    *,
+    per_page: int = PER_PAGE,
+    concurrency: int = PAGE_CONCURRENCY,
+) -> list[dict]:
+    """Fetch every record of a collection, in order."""
+    pages = await fetch_all_pages(
+        client, url, params, per_page=per_page, concurrency=concurrency
+    )
+    return page_records(pages)
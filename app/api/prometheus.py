@@ -0,0 +1,246 @@
+import abc
+import logging
+import math
+import time
+from urllib.parse import urlsplit
+import httpx
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+API_PATH_PREFIX = "/people/v2"
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PAGE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+SYNC_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return f"{{{pairs}}}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric(abc.ABC):
+    """A named metric with a fixed set of label names, in the text format."""
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = labels
+        _registry.append(self)
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    @abc.abstractmethod
+    def samples(self) -> list[str]: ...
+
+    def render(self) -> str:
+        return "\n".join(
+            [
+                f"# HELP {self.name} {self.documentation}",
+                f"# TYPE {self.name} {self.type}",
+                *self.samples(),
+            ]
+        )
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self.values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in self.values.items()
+        ]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def set(self, value: float, **labels: str):
+        self.values[self._key(labels)] = value
+
+    def clear(self):
+        self.values.clear()
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = (*sorted(buckets), math.inf)
+        self.counts: dict[tuple[str, ...], list[int]] = {}
+        self.sums: dict[tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        counts = self.counts.get(key)
+        if counts is None:
+            counts = self.counts[key] = [0] * len(self.buckets)
+            self.sums[key] = 0.0
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        self.sums[key] += value
+
+    def samples(self) -> list[str]:
+        lines = []
+        names = (*self.label_names, "le")
+        for key, counts in self.counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(names, (*key, _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(self.sums[key])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+_registry: list[_Metric] = []
+
+
+def render() -> str:
+    """Return every registered metric in the Prometheus text exposition format."""
+    return "\n".join(metric.render() for metric in _registry) + "\n"
+
+
+API_REQUESTS = Counter(
+    "pco_api_requests_total",
+    "Planning Center API responses by resource, method and status code.",
+    ("resource", "method", "status"),
+)
+API_REQUEST_SECONDS = Histogram(
+    "pco_api_request_duration_seconds",
+    "Planning Center API latency seen by callers, including rate-limit waits.",
+    ("resource",),
+)
+API_RESPONSE_BYTES = Counter(
+    "pco_api_response_bytes_total",
+    "Bytes downloaded from the Planning Center API, excluding cached bodies.",
+    ("resource",),
+)
+API_CACHE_HITS = Counter(
+    "pco_api_cache_hits_total",
+    "Planning Center API responses served from the HTTP cache after a 304.",
+    ("resource",),
+)
+API_THROTTLED = Counter(
+    "pco_api_throttled_total",
+    "Planning Center API requests answered with 429 Too Many Requests.",
+    ("resource",),
+)
+API_ERRORS = Counter(
+    "pco_api_transport_errors_total",
+    "Planning Center API requests that failed without a response.",
+    ("resource", "error"),
+)
+API_PAGES = Histogram(
+    "pco_api_pages",
+    "Pages fetched per paginated Planning Center collection download.",
+    ("resource",),
+    PAGE_BUCKETS,
+)
+SYNC_STAGE_SECONDS = Histogram(
+    "pco_sync_stage_duration_seconds",
+    "Wall time of each sync pipeline stage.",
+    ("stage", "status"),
+    SYNC_BUCKETS,
+)
+SYNC_SECONDS = Histogram(
+    "pco_sync_duration_seconds",
+    "Wall time of each organization sync.",
+    (),
+    SYNC_BUCKETS,
+)
+SYNC_LAST_SUCCESS = Gauge(
+    "pco_sync_last_success_timestamp_seconds",
+    "Unix time of each organization's last sync in which every stage succeeded.",
+    ("organization",),
+)
+DATASET_ROWS = Gauge(
+    "pco_dataset_rows",
+    "Rows held in each organization's shared dataset.",
+    ("organization", "resource"),
+)
+POOL_CONNECTIONS = Gauge(
+    "pco_api_connections",
+    "Pooled Planning Center API connections.",
+    ("state",),
+)
+HTTP_CACHE_ENTRIES = Gauge(
+    "pco_http_cache_entries", "Responses stored in the HTTP cache."
+)
+HTTP_CACHE_BYTES = Gauge("pco_http_cache_bytes", "Bytes stored in the HTTP cache.")
+
+
+def api_resource(url: httpx.URL | str) -> str:
+    """Return the collection a Planning Center API URL addresses, for labels.
+
+    ``/people/v2`` is the organization; record ids and other path segments
+    are dropped to keep label values bounded.
+    """
+    path = urlsplit(str(url)).path.removeprefix(API_PATH_PREFIX)
+    segment = path.strip("/").split("/")[0]
+    if not segment:
+        return "organization"
+    return segment if segment.replace("_", "").isalpha() else "other"
+
+
+def record_api_response(response: httpx.Response, downloaded: int, cache_hit: bool):
+    """Count a read response, its latency and its downloaded bytes.
+
+    Metrics must never fail a request, so errors here are only logged.
+    """
+    try:
+        resource = api_resource(response.request.url)
+        API_REQUESTS.inc(
+            resource=resource,
+            method=response.request.method,
+            status=str(response.status_code),
+        )
+        if cache_hit:
+            API_CACHE_HITS.inc(resource=resource)
+        else:
+            API_RESPONSE_BYTES.inc(downloaded, resource=resource)
+        API_REQUEST_SECONDS.observe(response.elapsed.total_seconds(), resource=resource)
+    except Exception as e:
+        logging.exception(f"Error recording API response metrics: {e}")
+
+
+def record_sync(timings: list[dict], started: float):
+    """Record the stage timings of one organization sync."""
+    for timing in timings:
+        SYNC_STAGE_SECONDS.observe(
+            timing["seconds"], stage=timing["name"], status=timing["status"]
+        )
+    SYNC_SECONDS.observe(time.time() - started)
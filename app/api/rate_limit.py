@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import httpx
+from app.api.prometheus import API_ERRORS, API_THROTTLED, api_resource
+
+DEFAULT_RATE_LIMIT = int(os.getenv("PCO_RATE_LIMIT", "100"))
+DEFAULT_RATE_PERIOD = float(os.getenv("PCO_RATE_PERIOD", "20"))
+MAX_RETRIES = int(os.getenv("PCO_MAX_RETRIES", "5"))
+RATE_LIMIT_HEADER = "X-PCO-API-Request-Rate-Limit"
+RATE_PERIOD_HEADER = "X-PCO-API-Request-Rate-Period"
+RATE_COUNT_HEADER = "X-PCO-API-Request-Rate-Count"
+
+
+class TokenBucket:
+    """A token bucket that tracks Planning Center's per-token request limit.
+
+    The bucket starts from the documented default and adopts whatever limit
+    and period the API reports in its response headers. When the API also
+    reports how many requests it has counted in the current period, the local
+    token count is lowered to match so that concurrent clients sharing a token
+    do not overshoot.
+    """
+
+    def __init__(
+        self, rate_limit: int = DEFAULT_RATE_LIMIT, period: float = DEFAULT_RATE_PERIOD
+    ):
+        self.capacity = rate_limit
+        self.period = period
+        self.tokens = float(rate_limit)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def rate(self) -> float:
+        """Tokens added per second."""
+        return self.capacity / self.period
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated_at
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        """Wait until a request may be sent, then take a token."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def update_from_headers(self, headers: httpx.Headers):
+        """Adopt the limit, period and usage reported by the API."""
+        try:
+            limit = int(headers[RATE_LIMIT_HEADER])
+            period = float(headers[RATE_PERIOD_HEADER])
+        except (KeyError, ValueError):
+            return
+        if limit > 0 and period > 0:
+            self._refill(time.monotonic())
+            self.capacity = limit
+            self.period = period
+            self.tokens = min(self.tokens, limit)
+        try:
+            count = int(headers[RATE_COUNT_HEADER])
+        except (KeyError, ValueError):
+            return
+        self.tokens = min(self.tokens, max(0, self.capacity - count))
+
+    def back_off(self, delay: float):
+        """Block every request on this bucket for ``delay`` seconds."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+        self.tokens = 0
+
+
+def retry_after_seconds(headers: httpx.Headers, attempt: int) -> float:
+    """Return how long to wait before retrying a throttled request."""
+    value = headers.get("Retry-After")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            pass
+    return float(2**attempt)
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """Transport that paces requests through a token bucket and retries 429s."""
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        bucket: TokenBucket | None = None,
+        max_retries: int = MAX_RETRIES,
+    ):
+        self.transport = transport
+        self.bucket = bucket or TokenBucket()
+        self.max_retries = max_retries
+        self.throttled = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            await self.bucket.acquire()
+            try:
+                response = await self.transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                API_ERRORS.inc(
+                    resource=api_resource(request.url), error=type(e).__name__
+                )
+                raise
+            self.bucket.update_from_headers(response.headers)
+            if response.status_code != 429 or attempt >= self.max_retries:
+                return response
+            self.throttled += 1
+            API_THROTTLED.inc(resource=api_resource(request.url))
+            delay = retry_after_seconds(response.headers, attempt)
+            logging.warning(
+                f"Planning Center rate limit hit for {request.url.path}, retrying in {delay:.1f}s"
+            )
+            await response.aclose()
+            self.bucket.back_off(delay)
+            attempt += 1
+
+    async def aclose(self):
+        await self.transport.aclose()
@@ -0,0 +1,91 @@
+import logging
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import FileResponse, JSONResponse, Response
+from starlette.routing import Route
+from app.api.avatars import (
+    AVATAR_ROUTE,
+    SVG_MEDIA_TYPE,
+    AvatarError,
+    get_avatar_cache,
+    is_allowed,
+)
+from app.api import prometheus
+from app.api.client import pool_stats
+from app.data.dataset import dataset_sizes
+from app.data.scheduler import last_sync_success, sync_timings
+from app.states.profiling import profile_report
+
+
+async def pool_stats_endpoint(request: Request) -> JSONResponse:
+    """Report Planning Center API connection pool statistics."""
+    return JSONResponse(pool_stats())
+
+
+async def sync_timings_endpoint(request: Request) -> JSONResponse:
+    """Report the per-stage timings of each organization's last sync."""
+    return JSONResponse(sync_timings())
+
+
+async def profile_endpoint(request: Request) -> JSONResponse:
+    """Rank profiled event handlers, worst first by the ``sort`` field."""
+    return JSONResponse(profile_report(request.query_params.get("sort", "")))
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    """Expose API traffic, sync and dataset metrics for Prometheus to scrape."""
+    stats = pool_stats()
+    prometheus.POOL_CONNECTIONS.set(stats["active_connections"], state="active")
+    prometheus.POOL_CONNECTIONS.set(stats["idle_connections"], state="idle")
+    prometheus.HTTP_CACHE_ENTRIES.set(stats["cache_entries"])
+    prometheus.HTTP_CACHE_BYTES.set(stats["cache_bytes"])
+    prometheus.SYNC_LAST_SUCCESS.clear()
+    for org_id, last_success in last_sync_success().items():
+        prometheus.SYNC_LAST_SUCCESS.set(last_success, organization=org_id)
+    prometheus.DATASET_ROWS.clear()
+    for org_id, sizes in dataset_sizes().items():
+        for resource, rows in sizes.items():
+            prometheus.DATASET_ROWS.set(rows, organization=org_id, resource=resource)
+    return Response(prometheus.render(), media_type=prometheus.CONTENT_TYPE)
+
+
+async def avatar_endpoint(request: Request) -> Response:
+    """Serve a cached thumbnail of a Planning Center avatar.
+
+    Thumbnails are content-addressed, so they are served with their digest as
+    ETag and may be cached by browsers indefinitely. Browsers must not sniff
+    them, and SVGs are sandboxed so they cannot run script on this origin.
+    """
+    source_url = request.query_params.get("url", "")
+    if not is_allowed(source_url):
+        return Response(status_code=400)
+    try:
+        thumbnail = await get_avatar_cache().get(source_url)
+    except (httpx.HTTPError, AvatarError) as e:
+        logging.warning(f"Error fetching avatar {source_url}: {e}")
+        return Response(status_code=502)
+    etag = f'"{thumbnail.digest}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "X-Content-Type-Options": "nosniff",
+    }
+    if thumbnail.media_type == SVG_MEDIA_TYPE:
+        headers["Content-Security-Policy"] = "default-src 'none'"
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status_code=304, headers=headers)
+    return FileResponse(
+        thumbnail.path, media_type=thumbnail.media_type, headers=headers
+    )
+
+
+api = Starlette(
+    routes=[
+        Route("/api/pool", pool_stats_endpoint),
+        Route("/api/sync", sync_timings_endpoint),
+        Route("/api/profile", profile_endpoint),
+        Route("/metrics", metrics_endpoint),
+        Route(AVATAR_ROUTE, avatar_endpoint),
+    ]
+)
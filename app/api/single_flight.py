@@ -0,0 +1,38 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one in-flight call.
+
+    Keys are ``(org_id, resource, query)`` tuples. Every caller that arrives
+    while a call for its key is running awaits that call's result (or
+    exception) instead of starting its own. Cancelling one waiter does not
+    cancel the shared call.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Task] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` for ``key``, or join the call already running for it."""
+        task = self._calls.get(key)
+        if task is None:
+            self.started += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        """Return the number of calls currently running."""
+        return len(self._calls)
+
+
+flights = SingleFlight()
@@ -0,0 +1,81 @@
+import os
+import time
+from typing import Any, Callable, TypedDict
+import httpx
+from app.api.pagination import fetch_all_records, iter_records
+
+UPDATED_SINCE_FILTER = "where[updated_at][gte]"
+DELETION_CHECK_INTERVAL = float(os.getenv("PCO_DELETION_CHECK_INTERVAL", "3600"))
+FULL_SYNC_INTERVAL = float(os.getenv("PCO_FULL_SYNC_INTERVAL", "86400"))
+
+
+class SyncCursor(TypedDict):
+    watermark: str
+    last_full_sync: float
+    last_deletion_check: float
+
+
+def advance_watermark(records: list[dict], watermark: str = "") -> str:
+    """Return the newest ``updated_at`` among records, or the current watermark."""
+    return max(
+        [watermark, *(item["attributes"].get("updated_at") or "" for item in records)]
+    )
+
+
+async def fetch_total_count(
+    client: httpx.AsyncClient, url: str, params: dict[str, str | int] | None = None
+) -> int:
+    """Return ``meta.total_count`` for a collection using a one-record page."""
+    response = await client.get(url, params={**(params or {}), "per_page": 1})
+    response.raise_for_status()
+    return response.json().get("meta", {}).get("total_count", 0)
+
+
+async def sync_collection(
+    client: httpx.AsyncClient,
+    url: str,
+    params: dict[str, str | int],
+    existing: list[dict],
+    cursor: SyncCursor | None,
+    transform: Callable[[dict], dict | None],
+    merge: Callable[[Any, list[dict], Callable], Any],
+    delta_params: dict[str, str | int] | None = None,
+    on_page: Callable[[list[dict], int | None], None] | None = None,
+) -> tuple[Any, SyncCursor, list[dict]]:
+    """Bring a collection up to date, downloading only what changed when possible."""
+    now = time.time()
+    if cursor is None or now - cursor["last_full_sync"] >= FULL_SYNC_INTERVAL:
+        records = []
+        rows = []
+        async for page, total_count in iter_records(client, url, params):
+            page_rows = [row for row in map(transform, page) if row is not None]
+            records.extend(page)
+            rows.extend(page_rows)
+            if on_page is not None:
+                on_page(page_rows, total_count)
+        return (
+            rows,
+            {
+                "watermark": advance_watermark(records),
+                "last_full_sync": now,
+                "last_deletion_check": now,
+            },
+            records,
+        )
+    records = await fetch_all_records(
+        client,
+        url,
+        {
+            **(params if delta_params is None else delta_params),
+            UPDATED_SINCE_FILTER: cursor["watermark"],
+        },
+    )
+    rows = merge(existing, records, transform)
+    cursor = {**cursor, "watermark": advance_watermark(records, cursor["watermark"])}
+    if now - cursor["last_deletion_check"] >= DELETION_CHECK_INTERVAL:
+        cursor["last_deletion_check"] = now
+        if await fetch_total_count(client, url, params) != len(rows):
+            return await sync_collection(
+                client, url, params, [], None, transform, merge, on_page=on_page
+            )
+    return rows, cursor, records
@@ -9,6 +9,10 @@ from app.pages.settings import settings_page
 from app.pages.people_page import people_page
 from app.states.people_state import PeopleState
 from app.states.settings_state import SettingsState
+from app.api.avatars import avatar_cache_lifespan
+from app.api.client import client_pool_lifespan
+from app.api.routes import api
+from app.data.scheduler import scheduler_lifespan
 
 
 def index() -> rx.Component:
@@ -48,7 +52,11 @@ app = rx.App(
             rel="stylesheet",
         ),
     ],
+    api_transformer=api,
 )
+app.register_lifespan_task(client_pool_lifespan)
+app.register_lifespan_task(scheduler_lifespan)
+app.register_lifespan_task(avatar_cache_lifespan)
 from app.pages.callback_page import callback_page
 
 app.add_page(index, route="/", on_load=AppState.on_load)
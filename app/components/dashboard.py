@@ -130,8 +130,28 @@ def dashboard() -> rx.Component:
                     ),
                 ),
                 rx.el.div(
-                    chart_card("Team Engagement", AppState.team_chart_data, "#6366f1"),
-                    class_name="grid grid-cols-1 lg:grid-cols-2 gap-6 mt-8",
+                    rx.el.select(
+                        rx.el.option("Daily", value="day"),
+                        rx.el.option("Weekly", value="week"),
+                        rx.el.option("Monthly", value="month"),
+                        default_value=AppState.growth_granularity,
+                        on_change=AppState.set_growth_granularity,
+                        class_name="bg-white border border-gray-300 rounded-lg px-3 py-1 text-sm focus:outline-none focus:ring-2 focus:ring-teal-500",
+                    ),
+                    rx.el.select(
+                        rx.el.option("Last 90 days", value="90"),
+                        rx.el.option("Last year", value="365"),
+                        rx.el.option("Last 3 years", value="1095"),
+                        rx.el.option("All time", value="0"),
+                        default_value=AppState.growth_range_days,
+                        on_change=AppState.set_growth_range_days,
+                        class_name="bg-white border border-gray-300 rounded-lg px-3 py-1 text-sm focus:outline-none focus:ring-2 focus:ring-teal-500",
+                    ),
+                    class_name="flex justify-end gap-2 mt-8",
+                ),
+                rx.el.div(
+                    chart_card("Volunteer Growth", AppState.team_chart_data, "#6366f1"),
+                    class_name="grid grid-cols-1 lg:grid-cols-2 gap-6 mt-4",
                 ),
             ),
         ),
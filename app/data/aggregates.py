@@ -0,0 +1,94 @@
+from collections import Counter, defaultdict
+from typing import Iterable
+
+
+class TeamCounts:
+    """Volunteers per team, kept up to date as people, teams and positions change.
+
+    Counts are per team id and only include positions held by active people.
+    The sorted composition is cached until the next change.
+    """
+
+    def __init__(self):
+        self.team_names: dict[str, str] = {}
+        self.active_people: set[str] = set()
+        self.positions: dict[str, tuple[str, str]] = {}
+        self.positions_by_person: dict[str, Counter[str]] = defaultdict(Counter)
+        self.counts: Counter[str] = Counter()
+        self._composition: list[dict] | None = None
+
+    def rebuild(
+        self,
+        person_ids: Iterable[str],
+        team_names: dict[str, str],
+        positions: Iterable[tuple[str, str, str]],
+    ):
+        """Recompute every count from scratch.
+
+        Takes the active person ids, team names by id and
+        ``(position_id, team_id, person_id)`` triples.
+        """
+        self.team_names = dict(team_names)
+        self.active_people = set(person_ids)
+        self.positions = {}
+        self.positions_by_person = defaultdict(Counter)
+        self.counts = Counter()
+        self._composition = None
+        for position_id, team_id, person_id in positions:
+            self.set_position(position_id, {"team_id": team_id, "person_id": person_id})
+
+    def set_person(self, person_id: str, active: bool):
+        """Record that a person became active or stopped being active."""
+        if active == (person_id in self.active_people):
+            return
+        delta = 1 if active else -1
+        if active:
+            self.active_people.add(person_id)
+        else:
+            self.active_people.discard(person_id)
+        for team_id, held in self.positions_by_person.get(person_id, {}).items():
+            self.counts[team_id] += delta * held
+        self._composition = None
+
+    def set_team(self, team_id: str, name: str | None):
+        """Record a team's new name, or with ``None`` its removal."""
+        if name is None:
+            self.team_names.pop(team_id, None)
+        else:
+            self.team_names[team_id] = name
+        self._composition = None
+
+    def set_position(self, position_id: str, position: dict | None):
+        """Record a team position's new team and person, or with ``None`` its removal."""
+        previous = self.positions.pop(position_id, None)
+        if previous is not None:
+            team_id, person_id = previous
+            self.positions_by_person[person_id][team_id] -= 1
+            if person_id in self.active_people:
+                self.counts[team_id] -= 1
+        if position is not None and position["person_id"]:
+            team_id, person_id = position["team_id"], position["person_id"]
+            self.positions[position_id] = (team_id, person_id)
+            self.positions_by_person[person_id][team_id] += 1
+            if person_id in self.active_people:
+                self.counts[team_id] += 1
+        self._composition = None
+
+    def team_ids_for(self, person_id: str) -> list[str]:
+        """Return the ids of the teams a person holds a position on."""
+        held = self.positions_by_person.get(person_id, {})
+        return [team_id for team_id, count in held.items() if count > 0]
+
+    def composition(self) -> list[dict]:
+        """Return ``{"name", "value"}`` rows of volunteers per team, largest first."""
+        if self._composition is None:
+            team_counts: Counter[str] = Counter()
+            for team_id, count in self.counts.items():
+                team_name = self.team_names.get(team_id)
+                if team_name and count > 0:
+                    team_counts[team_name] += count
+            self._composition = [
+                {"name": name, "value": count}
+                for name, count in team_counts.most_common()
+            ]
+        return self._composition
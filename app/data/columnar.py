@@ -0,0 +1,254 @@
+from array import array
+from typing import Callable, Iterable, Iterator
+
+
+class Interner:
+    """Assigns dense integer codes to strings in first-seen order.
+
+    Codes are never reused, so arrays indexed by code stay valid as the
+    interner grows.
+    """
+
+    __slots__ = ("values", "codes")
+
+    def __init__(self):
+        self.values: list[str] = []
+        self.codes: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def intern(self, value: str) -> int:
+        """Return the code of a string, assigning the next one if it is new."""
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def get(self, value: str) -> int:
+        """Return the code of a string, or -1 if it was never interned."""
+        return self.codes.get(value, -1)
+
+
+class CodedColumn:
+    """A column of strings stored as ``int32`` codes into an ``Interner``.
+
+    Columns of ids share their resource's interner across tables; columns of
+    repeated values (statuses, default avatars) get an interner of their own,
+    which dictionary-encodes them.
+    """
+
+    __slots__ = ("interner", "codes")
+
+    def __init__(self, interner: Interner | None = None, codes: array | None = None):
+        self.interner = interner if interner is not None else Interner()
+        self.codes = codes if codes is not None else array("i")
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def get(self, position: int) -> str:
+        return self.interner.values[self.codes[position]]
+
+    def set(self, position: int, value: str):
+        self.codes[position] = self.interner.intern(value)
+
+    def append(self, value: str):
+        self.codes.append(self.interner.intern(value))
+
+    def take(self, positions: list[int]) -> "CodedColumn":
+        codes = self.codes
+        return CodedColumn(self.interner, array("i", [codes[i] for i in positions]))
+
+    def copy(self) -> "CodedColumn":
+        return CodedColumn(self.interner, array("i", self.codes))
+
+    def empty(self) -> "CodedColumn":
+        return CodedColumn(self.interner)
+
+    def values(self) -> list[str]:
+        values = self.interner.values
+        return [values[code] for code in self.codes]
+
+
+class TextColumn:
+    """A column of mostly distinct strings, stored as a plain list."""
+
+    __slots__ = ("items",)
+
+    def __init__(self, items: list[str] | None = None):
+        self.items = items if items is not None else []
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def get(self, position: int) -> str:
+        return self.items[position]
+
+    def set(self, position: int, value: str):
+        self.items[position] = value
+
+    def append(self, value: str):
+        self.items.append(value)
+
+    def take(self, positions: list[int]) -> "TextColumn":
+        items = self.items
+        return TextColumn([items[i] for i in positions])
+
+    def copy(self) -> "TextColumn":
+        return TextColumn(list(self.items))
+
+    def empty(self) -> "TextColumn":
+        return TextColumn()
+
+    def values(self) -> list[str]:
+        return self.items
+
+
+Column = CodedColumn | TextColumn
+
+
+class ColumnTable:
+    """Rows of one resource stored column by column.
+
+    The ``id`` column must be a ``CodedColumn``; rows are looked up by id
+    through an array from id code to row position. Rows are materialized as
+    dicts only when indexed or iterated, so the UI and the snapshot store keep
+    their dict-shaped interface.
+    """
+
+    __slots__ = ("columns", "_positions")
+
+    def __init__(self, columns: dict[str, Column]):
+        self.columns = columns
+        self._positions = array("i")
+        self._index(0)
+
+    def _index(self, start: int):
+        ids = self.columns["id"].codes
+        positions = self._positions
+        for position in range(start, len(ids)):
+            code = ids[position]
+            if code >= len(positions):
+                positions.extend(array("i", [-1]) * (code + 1 - len(positions)))
+            positions[code] = position
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    def __getitem__(self, position: int) -> dict:
+        return {name: column.get(position) for name, column in self.columns.items()}
+
+    def __iter__(self) -> Iterator[dict]:
+        for position in range(len(self)):
+            yield self[position]
+
+    def value(self, position: int, name: str) -> str | int:
+        """Return one field of one row without materializing the row."""
+        return self.columns[name].get(position)
+
+    def column(self, name: str) -> list:
+        """Return a column's values in row order."""
+        return self.columns[name].values()
+
+    def position(self, row_id: str) -> int | None:
+        """Return the position of the row with an id, if present."""
+        code = self.columns["id"].interner.get(row_id)
+        if 0 <= code < len(self._positions):
+            position = self._positions[code]
+            if position >= 0:
+                return position
+        return None
+
+    def empty(self) -> "ColumnTable":
+        """Return an empty table with the same columns and interners."""
+        return ColumnTable(
+            {name: column.empty() for name, column in self.columns.items()}
+        )
+
+    def extend(self, rows: Iterable[dict]):
+        """Append rows."""
+        start = len(self)
+        for row in rows:
+            for name, column in self.columns.items():
+                column.append(row[name])
+        self._index(start)
+
+    def merged(
+        self, changed: list[dict], transform: Callable[[dict], dict | None]
+    ) -> "ColumnTable":
+        """Return a copy with changed API records applied.
+
+        Rows keep their position, new rows are appended, and records that
+        ``transform`` maps to ``None`` are removed.
+        """
+        updates = {item["id"]: transform(item) for item in changed}
+        columns = {name: column.copy() for name, column in self.columns.items()}
+        removed = set()
+        appended = []
+        for row_id, row in updates.items():
+            position = self.position(row_id)
+            if position is None:
+                if row is not None:
+                    appended.append(row)
+            elif row is None:
+                removed.add(position)
+            else:
+                for name, column in columns.items():
+                    column.set(position, row[name])
+        if removed:
+            kept = [i for i in range(len(self)) if i not in removed]
+            columns = {name: column.take(kept) for name, column in columns.items()}
+        table = ColumnTable(columns)
+        table.extend(appended)
+        return table
+
+
+class FieldValues:
+    """Custom field values per person, dictionary-encoded.
+
+    Each distinct value is stored once; each field definition is an array of
+    value codes indexed by person id code, with -1 where a person has no value.
+    """
+
+    __slots__ = ("people", "values", "columns")
+
+    def __init__(self, people: Interner):
+        self.people = people
+        self.values = Interner()
+        self.columns: dict[str, array] = {}
+
+    def __len__(self) -> int:
+        """Return the number of stored values across every field definition."""
+        return sum(map(self.count, self.columns))
+
+    def set(self, person_id: str, field_definition_id: str, value: str):
+        code = self.people.intern(person_id)
+        column = self.columns.get(field_definition_id)
+        if column is None:
+            column = self.columns[field_definition_id] = array("i")
+        if code >= len(column):
+            column.extend(array("i", [-1]) * (code + 1 - len(column)))
+        column[code] = self.values.intern(value)
+
+    def count(self, field_definition_id: str) -> int:
+        """Return the number of people with a value for a field definition."""
+        column = self.columns.get(field_definition_id)
+        return 0 if column is None else len(column) - column.count(-1)
+
+    def for_person(self, person_id: str) -> dict[str, str]:
+        """Return a person's values keyed by field definition id."""
+        code = self.people.get(person_id)
+        if code < 0:
+            return {}
+        values = self.values.values
+        return {
+            field_definition_id: values[column[code]]
+            for field_definition_id, column in self.columns.items()
+            if code < len(column) and column[code] >= 0
+        }
+
+    def clear(self):
+        self.values = Interner()
+        self.columns = {}
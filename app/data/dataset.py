@@ -0,0 +1,632 @@
+import asyncio
+import time
+from collections import OrderedDict, defaultdict
+from typing import Callable, Iterable
+import httpx
+from app.states.auth_state import API_BASE_URL
+from app.api.pagination import fetch_all_pages, fetch_all_records, page_records
+from app.api.single_flight import flights
+from app.api.sync import (
+    SyncCursor,
+    UPDATED_SINCE_FILTER,
+    advance_watermark,
+    fetch_total_count,
+    sync_collection,
+)
+from app.data.aggregates import TeamCounts
+from app.data.columnar import (
+    CodedColumn,
+    ColumnTable,
+    FieldValues,
+    Interner,
+    TextColumn,
+)
+from app.data.search import SearchIndex
+from app.data.store import SnapshotStore, get_store
+
+VIEW_CACHE_SIZE = 64
+SORT_KEYS = ("name", "join_date", "team")
+
+
+def _field_datum_person_id(datum: dict) -> str | None:
+    """Return the id of the person a field datum belongs to, if any."""
+    relationships = datum.get("relationships", {})
+    for key in ("customizable", "person"):
+        related = (relationships.get(key) or {}).get("data")
+        if related and related.get("type", "Person") == "Person":
+            return related["id"]
+    return None
+
+
+def _to_person(item: dict) -> dict | None:
+    """Transform a Person record, or ``None`` if they are no longer active."""
+    if item["attributes"]["status"] != "active":
+        return None
+    return {
+        "id": item["id"],
+        "name": item["attributes"]["name"],
+        "status": item["attributes"]["status"],
+        "avatar": item["attributes"]["avatar"],
+        "created_at": item["attributes"].get("created_at") or "",
+    }
+
+
+def _to_team(item: dict) -> dict:
+    return {"id": item["id"], "name": item["attributes"]["name"]}
+
+
+def _to_team_position(item: dict) -> dict:
+    """Transform a TeamPosition record; unassigned positions get an empty person_id."""
+    relationships = item.get("relationships", {})
+    person = (relationships.get("person") or {}).get("data") or {}
+    return {
+        "id": item["id"],
+        "team_id": relationships["team"]["data"]["id"],
+        "person_id": person.get("id", ""),
+    }
+
+
+PERSON_FIELDS = {"fields[Person]": "name,status,avatar,created_at,updated_at"}
+FIELD_DATA_FIELDS = {
+    "fields[FieldDatum]": "value,updated_at,customizable,person,field_definition",
+    "fields[FieldDefinition]": "name",
+}
+
+RESOURCES: dict[
+    str,
+    tuple[
+        dict[str, str | int], dict[str, str | int] | None, Callable[[dict], dict | None]
+    ],
+] = {
+    "people": ({"where[status]": "active", **PERSON_FIELDS}, PERSON_FIELDS, _to_person),
+    "teams": ({"fields[Team]": "name,updated_at"}, None, _to_team),
+    "team_positions": (
+        {"fields[TeamPosition]": "team,person,updated_at"},
+        None,
+        _to_team_position,
+    ),
+}
+
+
+# Column kinds per resource: "text", "category" (dictionary-encoded), or
+# the resource whose ids the column holds, coded through that resource's interner.
+TABLE_COLUMNS: dict[str, dict[str, str]] = {
+    "people": {
+        "id": "people",
+        "name": "text",
+        "status": "category",
+        "avatar": "category",
+        "created_at": "text",
+    },
+    "teams": {"id": "teams", "name": "text"},
+    "team_positions": {
+        "id": "team_positions",
+        "team_id": "teams",
+        "person_id": "people",
+    },
+}
+
+
+async def fetch_field_definitions(
+    client: httpx.AsyncClient, org_id: str
+) -> list[dict[str, str]]:
+    """Return an organization's field definitions as ``id``/``name`` dicts, by name."""
+    records = await flights.do(
+        (org_id, "field_definitions", ""),
+        lambda: fetch_all_records(
+            client,
+            f"{API_BASE_URL}/people/v2/field_definitions",
+            {"fields[FieldDefinition]": "name"},
+        ),
+    )
+    return sorted(
+        [{"id": item["id"], "name": item["attributes"]["name"]} for item in records],
+        key=lambda x: x["name"],
+    )
+
+
+async def fetch_field_data(
+    client: httpx.AsyncClient,
+    field_definition_ids: list[str],
+    updated_since: str | None = None,
+) -> tuple[list[tuple[str, str, str, str]], str]:
+    """Fetch field data for the given definitions org-wide.
+
+    With ``updated_since`` only field data changed since that watermark is
+    fetched. Returns ``(person_id, field_definition_id, field_name, value)``
+    rows and the newest ``updated_at`` seen. Errors propagate, so a sync never
+    records a definition it failed to fetch as up to date.
+    """
+    field_rows = []
+    watermark = updated_since or ""
+    for field_def_id in field_definition_ids:
+        params = {
+            "where[field_definition_id]": field_def_id,
+            "include": "field_definition",
+            **FIELD_DATA_FIELDS,
+        }
+        if updated_since:
+            params[UPDATED_SINCE_FILTER] = updated_since
+        pages = await fetch_all_pages(
+            client, f"{API_BASE_URL}/people/v2/field_data", params
+        )
+        field_name = next(
+            (
+                item["attributes"]["name"]
+                for item in page_records(pages, "included")
+                if item["type"] == "FieldDefinition" and item["id"] == field_def_id
+            ),
+            None,
+        )
+        if not field_name:
+            continue
+        records = page_records(pages)
+        watermark = advance_watermark(records, watermark)
+        for datum in records:
+            person_id = _field_datum_person_id(datum)
+            field_definition = datum["relationships"]["field_definition"]["data"]
+            if person_id and field_definition["id"] == field_def_id:
+                value = str(datum["attributes"].get("value", "N/A"))
+                field_rows.append((person_id, field_def_id, field_name, value))
+    return field_rows, watermark
+
+
+class OrgDataset:
+    """Server-side copy of one organization's people, teams and team positions.
+
+    A single instance per organization is shared by every session, so the full
+    dataset lives once in backend memory and sessions only copy the slices they
+    display into their Reflex state. Rows are held in columnar tables with ids
+    interned to integer codes, and are only shaped into dicts for the UI.
+    """
+
+    def __init__(self, org_id: str):
+        self.org_id = org_id
+        self.ids: dict[str, Interner] = {resource: Interner() for resource in RESOURCES}
+        self.rows: dict[str, ColumnTable] = {
+            resource: self._new_table(resource) for resource in RESOURCES
+        }
+        self.field_values = FieldValues(self.ids["people"])
+        self.field_names: dict[str, str] = {}
+        self.field_definition_ids: set[str] = set()
+        self.cursors: dict[str, SyncCursor] = {}
+        self.loaded = False
+        self.search_index = SearchIndex()
+        self.team_counts = TeamCounts()
+        self.progress: dict[str, tuple[int, int]] = {}
+        self.synced_at: dict[str, float] = {}
+        self._views: OrderedDict[tuple[str, str], list[int]] = OrderedDict()
+        self._orders: dict[str, tuple[list[int], list[int]]] = {}
+        self._locks: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    @property
+    def people(self) -> ColumnTable:
+        return self.rows["people"]
+
+    @property
+    def teams(self) -> ColumnTable:
+        return self.rows["teams"]
+
+    @property
+    def team_positions(self) -> ColumnTable:
+        return self.rows["team_positions"]
+
+    def _new_table(self, resource: str, rows: Iterable[dict] = ()) -> ColumnTable:
+        columns = {}
+        for name, kind in TABLE_COLUMNS[resource].items():
+            if kind == "text":
+                columns[name] = TextColumn()
+            elif kind == "category":
+                columns[name] = CodedColumn()
+            else:
+                columns[name] = CodedColumn(self.ids[kind])
+        table = ColumnTable(columns)
+        table.extend(rows)
+        return table
+
+    async def load_snapshot(self):
+        """Fill the dataset from the on-disk snapshot, once per process."""
+        async with self._locks["snapshot"]:
+            if self.loaded:
+                return
+            store = get_store()
+            for resource in RESOURCES:
+                self.rows[resource] = await asyncio.to_thread(
+                    self._load_table, store, resource
+                )
+            field_rows = await asyncio.to_thread(store.load_field_data, self.org_id)
+            self._apply_field_rows(field_rows)
+            self.cursors = await asyncio.to_thread(store.load_cursors, self.org_id)
+            self._rebuild_team_counts()
+            await self._rebuild_search_index()
+            self.loaded = True
+
+    def _load_table(self, store: SnapshotStore, resource: str) -> ColumnTable:
+        return self._new_table(resource, store.load_rows(self.org_id, resource))
+
+    async def sync(self, client: httpx.AsyncClient, resource: str) -> bool:
+        """Sync one resource incrementally and store its rows and new cursor.
+
+        Concurrent calls for the same resource share one in-flight sync.
+        Returns whether a full download happened.
+        """
+        return await flights.do(
+            (self.org_id, resource, ""), lambda: self._sync(client, resource)
+        )
+
+    async def _sync(self, client: httpx.AsyncClient, resource: str) -> bool:
+        params, delta_params, transform = RESOURCES[resource]
+        async with self._locks[resource]:
+            cursor = self.cursors.get(resource)
+            streaming = not len(self.rows[resource])
+            loaded = 0
+
+            def on_page(page_rows: list[dict], total_count: int | None):
+                """Publish each page of a first download as soon as it arrives."""
+                nonlocal loaded
+                loaded += len(page_rows)
+                self.progress[resource] = (loaded, total_count or loaded)
+                if streaming:
+                    self.rows[resource].extend(page_rows)
+                    self._invalidate_views()
+
+            try:
+                rows, new_cursor, records = await sync_collection(
+                    client,
+                    f"{API_BASE_URL}/people/v2/{resource}",
+                    params,
+                    self.rows[resource],
+                    cursor,
+                    transform,
+                    ColumnTable.merged,
+                    delta_params,
+                    on_page,
+                )
+            except BaseException:
+                if streaming:
+                    self.rows[resource] = self._new_table(resource)
+                raise
+            finally:
+                self.progress.pop(resource, None)
+            is_full = cursor is None or new_cursor["last_full_sync"] != cursor[
+                "last_full_sync"
+            ]
+            store = get_store()
+            if is_full:
+                await asyncio.to_thread(
+                    store.save_rows, self.org_id, resource, rows, None, True
+                )
+            else:
+                updates = {item["id"]: transform(item) for item in records}
+                await asyncio.to_thread(
+                    store.save_rows,
+                    self.org_id,
+                    resource,
+                    [row for row in updates.values() if row is not None],
+                    [row_id for row_id, row in updates.items() if row is None],
+                )
+            await asyncio.to_thread(
+                store.save_cursor, self.org_id, resource, new_cursor
+            )
+            if isinstance(rows, ColumnTable):
+                self.rows[resource] = rows
+            elif not streaming:
+                self.rows[resource] = self._new_table(resource, rows)
+            self.cursors[resource] = new_cursor
+            self.synced_at[resource] = time.time()
+            if is_full:
+                self._rebuild_team_counts()
+            else:
+                self._update_team_counts(resource, updates)
+            self._invalidate_views()
+            if resource == "people":
+                if is_full:
+                    await self._rebuild_search_index()
+                else:
+                    self._reindex_people([item["id"] for item in records])
+            return is_full
+
+    async def sync_field_data(
+        self, client: httpx.AsyncClient, field_definition_ids: list[str]
+    ):
+        """Sync the field data of the requested definitions.
+
+        Field data for definitions already being tracked is fetched as a delta
+        unless people were downloaded in full since the last field data sync;
+        newly requested definitions are fetched in full and tracked from then
+        on. Concurrent calls for the same definitions share one in-flight sync.
+        """
+        await flights.do(
+            (self.org_id, "field_data", tuple(sorted(field_definition_ids))),
+            lambda: self._sync_field_data(client, field_definition_ids),
+        )
+
+    async def _sync_field_data(
+        self, client: httpx.AsyncClient, field_definition_ids: list[str]
+    ):
+        async with self._locks["field_data"]:
+            cursor = self.cursors.get("field_data")
+            people_cursor = self.cursors["people"]
+            tracked = self.field_definition_ids | set(field_definition_ids)
+            full = (
+                cursor is None
+                or cursor["last_full_sync"] != people_cursor["last_full_sync"]
+            )
+            if (
+                not full
+                and cursor["last_deletion_check"]
+                != people_cursor["last_deletion_check"]
+            ):
+                full = await self._field_data_deleted(client)
+            if full:
+                field_rows, watermark = await fetch_field_data(client, sorted(tracked))
+                replace = True
+            else:
+                new_ids = sorted(tracked - self.field_definition_ids)
+                field_rows, watermark = await fetch_field_data(
+                    client, sorted(self.field_definition_ids), cursor["watermark"]
+                )
+                new_rows, _ = await fetch_field_data(client, new_ids)
+                field_rows.extend(new_rows)
+                replace = False
+            new_cursor = {**people_cursor, "watermark": watermark}
+            store = get_store()
+            await asyncio.to_thread(
+                store.save_field_data,
+                self.org_id,
+                field_rows,
+                sorted(tracked),
+                replace,
+            )
+            await asyncio.to_thread(
+                store.save_cursor, self.org_id, "field_data", new_cursor
+            )
+            if replace:
+                self.field_values.clear()
+            self._apply_field_rows(field_rows)
+            self.field_definition_ids = tracked
+            self.cursors["field_data"] = new_cursor
+            if replace:
+                await self._rebuild_search_index()
+            else:
+                self._reindex_people({row[0] for row in field_rows})
+
+    async def _field_data_deleted(self, client: httpx.AsyncClient) -> bool:
+        """Whether field data of a tracked definition was deleted upstream.
+
+        Deltas only return changed records, so deletions are found the way
+        ``sync_collection`` finds them: by comparing stored counts with the
+        API's ``total_count``, whenever people run their deletion check.
+        """
+        for field_def_id in sorted(self.field_definition_ids):
+            total_count = await fetch_total_count(
+                client,
+                f"{API_BASE_URL}/people/v2/field_data",
+                {"where[field_definition_id]": field_def_id},
+            )
+            if total_count != self.field_values.count(field_def_id):
+                return True
+        return False
+
+    def _rebuild_team_counts(self):
+        positions = self.team_positions
+        self.team_counts.rebuild(
+            self.people.column("id"),
+            dict(zip(self.teams.column("id"), self.teams.column("name"))),
+            zip(
+                positions.column("id"),
+                positions.column("team_id"),
+                positions.column("person_id"),
+            ),
+        )
+
+    def _update_team_counts(self, resource: str, updates: dict[str, dict | None]):
+        """Adjust the team counts for the rows a delta sync changed."""
+        for row_id, row in updates.items():
+            if resource == "people":
+                self.team_counts.set_person(row_id, row is not None)
+            elif resource == "teams":
+                self.team_counts.set_team(row_id, row["name"] if row else None)
+            elif resource == "team_positions":
+                self.team_counts.set_position(row_id, row)
+
+    def _apply_field_rows(self, field_rows: list[tuple[str, str, str, str]]):
+        for person_id, field_def_id, field_name, value in field_rows:
+            self.field_values.set(person_id, field_def_id, value)
+            self.field_names[field_def_id] = field_name
+            self.field_definition_ids.add(field_def_id)
+
+    def _search_documents(
+        self, person_ids: Iterable[str] | None = None
+    ) -> list[tuple[str, str, list[str]]]:
+        people = self.people
+        if person_ids is None:
+            documents = zip(people.column("id"), people.column("name"))
+        else:
+            positions = [people.position(person_id) for person_id in person_ids]
+            documents = (
+                (people.value(position, "id"), people.value(position, "name"))
+                for position in positions
+                if position is not None
+            )
+        return [
+            (person_id, name, list(self.field_values.for_person(person_id).values()))
+            for person_id, name in documents
+        ]
+
+    async def _rebuild_search_index(self):
+        """Rebuild the search index off the event loop and swap it in."""
+        self._invalidate_views()
+        self.search_index = await asyncio.to_thread(
+            _build_search_index, self._search_documents()
+        )
+
+    def _reindex_people(self, person_ids: Iterable[str]):
+        """Update the search index for people that changed or were removed."""
+        self._invalidate_views()
+        person_ids = list(person_ids)
+        for person_id in person_ids:
+            self.search_index.remove(person_id)
+        for person_id, name, field_values in self._search_documents(person_ids):
+            self.search_index.add(person_id, name, field_values)
+
+    def _invalidate_views(self):
+        self._views.clear()
+        self._orders.clear()
+
+    def _person_teams(self) -> dict[str, str]:
+        """Map each person id to the alphabetically first team they serve on."""
+        team_names = self.team_counts.team_names
+        person_teams = {}
+        for person_id in self.people.column("id"):
+            names = [
+                team_names[team_id]
+                for team_id in self.team_counts.team_ids_for(person_id)
+                if team_id in team_names
+            ]
+            if names:
+                person_teams[person_id] = min(names)
+        return person_teams
+
+    def _order(self, sort_key: str) -> tuple[list[int], list[int]]:
+        """Return the positions of ``people`` in a sort order, and each position's rank.
+
+        Orders are computed once per data change and reused for every page and
+        query until the next sync.
+        """
+        order = self._orders.get(sort_key)
+        if order is not None:
+            return order
+        people = self.people
+        if sort_key == "name":
+            keys = [name.casefold() for name in people.column("name")]
+        elif sort_key == "join_date":
+            keys = people.column("created_at")
+        elif sort_key == "team":
+            person_teams = self._person_teams()
+            keys = [
+                (
+                    person_id not in person_teams,
+                    person_teams.get(person_id, "").casefold(),
+                    name.casefold(),
+                )
+                for person_id, name in zip(people.column("id"), people.column("name"))
+            ]
+        else:
+            raise ValueError(f"Unknown sort key: {sort_key}")
+        positions = sorted(range(len(people)), key=keys.__getitem__)
+        ranks = [0] * len(people)
+        for rank, position in enumerate(positions):
+            ranks[position] = rank
+        order = self._orders[sort_key] = (positions, ranks)
+        return order
+
+    def view(self, query: str = "", sort_key: str = "") -> list[int] | None:
+        """Return the positions in ``people`` matching a search query, in order.
+
+        With a ``sort_key`` from ``SORT_KEYS`` the positions follow that
+        precomputed order, otherwise the dataset's own. ``None`` means every
+        person in dataset order. Results are cached per query and sort until
+        the data next changes.
+        """
+        query = " ".join(query.lower().split())
+        if not query and not sort_key:
+            return None
+        if not query:
+            return self._order(sort_key)[0]
+        positions = self._views.get((query, sort_key))
+        if positions is None:
+            found = self.search_index.search(query)
+            matches = [
+                position
+                for position in map(self.people.position, found)
+                if position is not None
+            ]
+            if sort_key:
+                positions = sorted(matches, key=self._order(sort_key)[1].__getitem__)
+            else:
+                positions = sorted(matches)
+            self._views[(query, sort_key)] = positions
+            if len(self._views) > VIEW_CACHE_SIZE:
+                self._views.popitem(last=False)
+        self._views.move_to_end((query, sort_key))
+        return positions
+
+    def is_fresh(self, resource: str, max_age: float) -> bool:
+        """Whether a resource was synced from the API within ``max_age`` seconds."""
+        return time.time() - self.synced_at.get(resource, 0.0) <= max_age
+
+    def sync_progress(self, resource: str) -> tuple[int, int] | None:
+        """Return ``(loaded, total)`` for a resource being downloaded in full."""
+        return self.progress.get(resource)
+
+    def view_size(self, positions: list[int] | None) -> int:
+        """Return the number of people in a view."""
+        return len(self.people) if positions is None else len(positions)
+
+    def person_window(
+        self,
+        start: int,
+        stop: int,
+        field_definition_ids: list[str],
+        positions: list[int] | None = None,
+    ) -> list[dict]:
+        """Return people ``start`` to ``stop`` of a view, shaped for the UI.
+
+        Rows are materialized from the columnar tables here, and only the given
+        field definitions are included in each person's ``field_data``, keyed
+        by field name.
+        """
+        people = self.people
+        selected = (
+            range(start, min(stop, len(people)))
+            if positions is None
+            else positions[start:stop]
+        )
+        window = []
+        for person in map(people.__getitem__, selected):
+            values = self.field_values.for_person(person["id"])
+            window.append(
+                {
+                    **person,
+                    "field_data": {
+                        self.field_names[field_def_id]: values[field_def_id]
+                        for field_def_id in field_definition_ids
+                        if field_def_id in values
+                    },
+                }
+            )
+        return window
+
+    def team_composition(self) -> list[dict]:
+        """Returns the cached number of volunteers per team, largest first."""
+        return self.team_counts.composition()
+
+
+def _build_search_index(documents: list[tuple[str, str, list[str]]]) -> SearchIndex:
+    index = SearchIndex()
+    for person_id, name, field_values in documents:
+        index.add(person_id, name, field_values)
+    return index
+
+
+_datasets: dict[str, OrgDataset] = {}
+
+
+def dataset_sizes() -> dict[str, dict[str, int]]:
+    """Return the number of rows of each resource in every organization's dataset."""
+    return {
+        org_id: {
+            **{resource: len(table) for resource, table in dataset.rows.items()},
+            "field_data": len(dataset.field_values),
+        }
+        for org_id, dataset in _datasets.items()
+    }
+
+
+def get_dataset(org_id: str) -> OrgDataset:
+    """Return the shared dataset of an organization, creating it if needed."""
+    dataset = _datasets.get(org_id)
+    if dataset is None:
+        dataset = _datasets[org_id] = OrgDataset(org_id)
+    return dataset
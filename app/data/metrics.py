@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+import httpx
+from app.states.auth_state import API_BASE_URL
+from app.api.single_flight import flights
+from app.api.sync import fetch_total_count
+from app.data.dataset import OrgDataset, get_dataset
+from app.data.growth import GrowthSeries, get_growth_series
+
+METRICS_STORE_MAX_AGE = float(os.getenv("PCO_METRICS_STORE_MAX_AGE", "900"))
+
+
+def _thirty_days_ago() -> str:
+    return (
+        datetime.utcnow().replace(second=0, microsecond=0) - timedelta(days=30)
+    ).isoformat() + "Z"
+
+
+class MetricQuery:
+    """A dashboard metric declared as a ``total_count`` query on a collection.
+
+    ``params`` builds the API filters each time the metric is evaluated. When
+    ``local`` is given and the dataset's copy of ``resource`` is fresh, the
+    metric is counted from the dataset with the same filters instead of asking
+    the API. API results are cached for ``ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        title: str,
+        icon: str,
+        color: str,
+        resource: str,
+        params: Callable[[], dict[str, str]],
+        ttl: float,
+        local: Callable[[OrgDataset, dict[str, str]], int] | None = None,
+    ):
+        self.key = key
+        self.title = title
+        self.icon = icon
+        self.color = color
+        self.resource = resource
+        self.params = params
+        self.ttl = ttl
+        self.local = local
+
+
+def _count_created_after(dataset: OrgDataset, params: dict[str, str]) -> int:
+    cutoff = params["where[created_at][gt]"]
+    return sum(
+        1 for created_at in dataset.people.column("created_at") if created_at > cutoff
+    )
+
+
+METRICS: list[MetricQuery] = [
+    MetricQuery(
+        "total_volunteers",
+        "Total Volunteers",
+        "users",
+        "text-teal-500",
+        "people",
+        lambda: {"where[status]": "active"},
+        ttl=300,
+        local=lambda dataset, params: len(dataset.people),
+    ),
+    MetricQuery(
+        "new_members_30d",
+        "New Members (30d)",
+        "user-check",
+        "text-green-500",
+        "people",
+        lambda: {
+            "where[status]": "active",
+            "where[created_at][gt]": _thirty_days_ago(),
+        },
+        ttl=900,
+        local=_count_created_after,
+    ),
+]
+
+
+class MetricsEngine:
+    """Evaluates one organization's dashboard metrics concurrently.
+
+    Each metric is answered from the shared dataset when it is fresh, and
+    otherwise from a cached API count; expired counts are fetched through the
+    shared client, with concurrent sessions sharing one in-flight request.
+    """
+
+    def __init__(self, org_id: str):
+        self.org_id = org_id
+        self._cache: dict[str, tuple[int, float]] = {}
+
+    async def evaluate(
+        self, client: httpx.AsyncClient, metrics: list[MetricQuery] = METRICS
+    ) -> dict[str, int]:
+        """Return the value of every metric that could be evaluated, by key."""
+        dataset = get_dataset(self.org_id)
+        results = await asyncio.gather(
+            *(self._evaluate(client, dataset, metric) for metric in metrics),
+            return_exceptions=True,
+        )
+        values = {}
+        for metric, result in zip(metrics, results):
+            if isinstance(result, BaseException):
+                logging.error(f"Error evaluating metric {metric.key}: {result}")
+            else:
+                values[metric.key] = result
+        return values
+
+    async def _evaluate(
+        self, client: httpx.AsyncClient, dataset: OrgDataset, metric: MetricQuery
+    ) -> int:
+        params = metric.params()
+        if metric.local is not None and dataset.is_fresh(
+            metric.resource, METRICS_STORE_MAX_AGE
+        ):
+            return metric.local(dataset, params)
+        cached = self._cache.get(metric.key)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+        url = f"{API_BASE_URL}/people/v2/{metric.resource}"
+        value = await flights.do(
+            (self.org_id, metric.resource, f"metric:{metric.key}"),
+            lambda: fetch_total_count(client, url, params),
+        )
+        self._cache[metric.key] = (value, time.monotonic() + metric.ttl)
+        return value
+
+
+_engines: dict[str, MetricsEngine] = {}
+
+
+def get_metrics_engine(org_id: str) -> MetricsEngine:
+    """Return the metrics engine of an organization, creating it if needed."""
+    engine = _engines.get(org_id)
+    if engine is None:
+        engine = _engines[org_id] = MetricsEngine(org_id)
+    return engine
+
+
+async def evaluate_dashboard(
+    client: httpx.AsyncClient, org_id: str
+) -> tuple[dict[str, int], GrowthSeries | None]:
+    """Evaluate every dashboard metric and fetch the growth series concurrently.
+
+    A growth series that cannot be fetched is logged and returned as ``None``,
+    so the metrics are still shown.
+    """
+    values, series = await asyncio.gather(
+        get_metrics_engine(org_id).evaluate(client),
+        get_growth_series(client, org_id),
+        return_exceptions=True,
+    )
+    if isinstance(values, BaseException):
+        raise values
+    if isinstance(series, BaseException):
+        logging.error(f"Error fetching growth series: {series}", exc_info=series)
+        series = None
+    return values, series
+
+
+def metric_cards(
+    values: dict[str, int], previous: dict[str, str]
+) -> list[dict[str, str]]:
+    """Format metric values for the dashboard, keeping old values of failed ones."""
+    return [
+        {
+            "title": metric.title,
+            "value": (
+                f"{values[metric.key]:,}"
+                if metric.key in values
+                else previous.get(metric.title, "0")
+            ),
+            "icon": metric.icon,
+            "color": metric.color,
+        }
+        for metric in METRICS
+    ]
@@ -0,0 +1,80 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, TypedDict
+from app.api.instrumentation import track_requests
+
+
+class StageTiming(TypedDict):
+    name: str
+    status: str
+    seconds: float
+    requests: int
+    bytes: int
+
+
+class Stage:
+    """One step of a load pipeline and the stages it has to wait for."""
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[], Awaitable[object]],
+        depends_on: tuple[str, ...] = (),
+    ):
+        self.name = name
+        self.run = run
+        self.depends_on = depends_on
+
+
+async def run_pipeline(stages: list[Stage]) -> list[StageTiming]:
+    """Run stages as soon as their dependencies finish, concurrently where possible.
+
+    A stage whose dependency failed is skipped. Returns the wall time, API
+    request count and bytes received of every stage, in the given order.
+    """
+    by_name = {stage.name: stage for stage in stages}
+    tasks: dict[str, asyncio.Task] = {}
+    timings: dict[str, StageTiming] = {}
+
+    async def run_stage(stage: Stage) -> bool:
+        dependencies = await asyncio.gather(
+            *(tasks[name] for name in stage.depends_on)
+        )
+        if not all(dependencies):
+            timings[stage.name] = {
+                "name": stage.name,
+                "status": "skipped",
+                "seconds": 0.0,
+                "requests": 0,
+                "bytes": 0,
+            }
+            return False
+        started = time.perf_counter()
+        status = "ok"
+        with track_requests() as stats:
+            try:
+                await stage.run()
+            except Exception as e:
+                status = "failed"
+                logging.exception(f"Pipeline stage {stage.name} failed: {e}")
+        timings[stage.name] = {
+            "name": stage.name,
+            "status": status,
+            "seconds": time.perf_counter() - started,
+            "requests": stats.requests,
+            "bytes": stats.bytes,
+        }
+        return status == "ok"
+
+    def start(stage: Stage) -> asyncio.Task:
+        if stage.name not in tasks:
+            for name in stage.depends_on:
+                start(by_name[name])
+            tasks[stage.name] = asyncio.create_task(run_stage(stage))
+        return tasks[stage.name]
+
+    for stage in stages:
+        start(stage)
+    await asyncio.gather(*tasks.values())
+    return [timings[stage.name] for stage in stages]
@@ -0,0 +1,214 @@
+import asyncio
+import contextlib
+import logging
+import os
+import random
+import time
+from typing import Awaitable, Callable
+import httpx
+from app.api.client import leased_client
+from app.api.prometheus import record_sync
+from app.data.dataset import OrgDataset
+from app.data.pipeline import Stage, StageTiming, run_pipeline
+
+SYNC_JITTER = float(os.getenv("PCO_SYNC_JITTER", "0.1"))
+
+
+class SyncScheduler:
+    """Refreshes one organization's dataset in the background on an interval.
+
+    Sessions register the access token, interval and field definitions they
+    want with ``configure``; the most recent registration wins. Each refresh
+    leases the pooled client of the newest token still registered, and tokens
+    are dropped on logout or when the API rejects them. A refresh that is due
+    while the previous one is still running is skipped, and callers that ask
+    for a refresh while one is running wait on that run instead of starting
+    another.
+    """
+
+    def __init__(self, dataset: OrgDataset):
+        self.dataset = dataset
+        self.tokens: list[str] = []
+        self.interval_minutes = 0
+        self.field_definition_ids: set[str] = set()
+        self.last_run_started = 0.0
+        self.last_success = 0.0
+        self.last_timings: list[StageTiming] = []
+        self._run: asyncio.Task | None = None
+        self._loop_task: asyncio.Task | None = None
+        self._configured = asyncio.Event()
+
+    def configure(
+        self,
+        token: str,
+        interval_minutes: int,
+        field_definition_ids: list[str],
+    ):
+        """Register the access token, interval and field definitions to sync with."""
+        self.forget(token)
+        self.tokens.append(token)
+        self.interval_minutes = max(0, interval_minutes)
+        self.field_definition_ids |= set(field_definition_ids)
+        self._configured.set()
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._loop())
+
+    def forget(self, token: str):
+        """Stop syncing with an access token that was signed out or rejected."""
+        if token in self.tokens:
+            self.tokens.remove(token)
+
+    def needs_sync(self) -> bool:
+        """Whether the dataset lacks data a page would need to render."""
+        return (
+            "people" not in self.dataset.cursors
+            or not self.field_definition_ids <= self.dataset.field_definition_ids
+        )
+
+    @property
+    def is_running(self) -> bool:
+        return self._run is not None and not self._run.done()
+
+    def run_once(self) -> asyncio.Task:
+        """Start a refresh, or return the one already running."""
+        if not self.is_running:
+            self.last_run_started = time.time()
+            self._run = asyncio.create_task(self._sync_all())
+        return self._run
+
+    async def _sync_all(self):
+        if not self.tokens:
+            return
+        token = self.tokens[-1]
+        dataset = self.dataset
+        field_definition_ids = sorted(self.field_definition_ids)
+
+        def authorized(run: Callable[[], Awaitable[object]]):
+            return lambda: self._run_authorized(token, run)
+
+        async with leased_client(token) as client:
+            self.last_timings = await run_pipeline(
+                [
+                    Stage("snapshot", dataset.load_snapshot),
+                    Stage(
+                        "people",
+                        authorized(lambda: dataset.sync(client, "people")),
+                        ("snapshot",),
+                    ),
+                    Stage(
+                        "field_data",
+                        authorized(
+                            lambda: dataset.sync_field_data(
+                                client, field_definition_ids
+                            )
+                        ),
+                        ("people",),
+                    ),
+                    Stage(
+                        "teams",
+                        authorized(lambda: dataset.sync(client, "teams")),
+                        ("snapshot",),
+                    ),
+                    Stage(
+                        "team_positions",
+                        authorized(lambda: dataset.sync(client, "team_positions")),
+                        ("snapshot",),
+                    ),
+                ]
+            )
+        logging.info(
+            f"Synced organization {dataset.org_id}: "
+            + ", ".join(
+                f"{timing['name']} {timing['status']} {timing['seconds']:.2f}s "
+                f"{timing['requests']} requests {timing['bytes']} bytes"
+                for timing in self.last_timings
+            )
+        )
+        record_sync(self.last_timings, self.last_run_started)
+        if all(timing["status"] == "ok" for timing in self.last_timings):
+            self.last_success = time.time()
+
+    async def _run_authorized(self, token: str, run: Callable[[], Awaitable[object]]):
+        """Run a sync stage, forgetting the token if the API rejects it."""
+        try:
+            await run()
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 401:
+                logging.warning(
+                    f"Dropping a rejected access token from the sync of organization {self.dataset.org_id}."
+                )
+                self.forget(token)
+            raise
+
+    def _next_delay(self) -> float | None:
+        if not self.interval_minutes:
+            return None
+        interval = self.interval_minutes * 60
+        jittered = interval * random.uniform(1 - SYNC_JITTER, 1 + SYNC_JITTER)
+        return max(0.0, self.last_run_started + jittered - time.time())
+
+    async def _loop(self):
+        while True:
+            delay = self._next_delay()
+            self._configured.clear()
+            if delay is None:
+                await self._configured.wait()
+                continue
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._configured.wait(), timeout=delay)
+                continue
+            if self.is_running:
+                logging.info(
+                    f"Skipping sync of organization {self.dataset.org_id}: previous run still in progress."
+                )
+                self.last_run_started = time.time()
+                continue
+            self.run_once()
+
+    async def stop(self):
+        """Cancel the scheduling loop and any running refresh."""
+        for task in (self._loop_task, self._run):
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+
+
+_schedulers: dict[str, SyncScheduler] = {}
+
+
+def sync_timings() -> dict[str, list[StageTiming]]:
+    """Return the stage timings of each organization's last sync."""
+    return {org_id: s.last_timings for org_id, s in _schedulers.items()}
+
+
+def last_sync_success() -> dict[str, float]:
+    """Return the Unix time of each organization's last fully successful sync."""
+    return {
+        org_id: s.last_success for org_id, s in _schedulers.items() if s.last_success
+    }
+
+
+def forget_token(token: str):
+    """Stop every scheduler from syncing with a signed-out access token."""
+    for scheduler in _schedulers.values():
+        scheduler.forget(token)
+
+
+def get_scheduler(dataset: OrgDataset) -> SyncScheduler:
+    """Return the scheduler of an organization's dataset, creating it if needed."""
+    scheduler = _schedulers.get(dataset.org_id)
+    if scheduler is None:
+        scheduler = _schedulers[dataset.org_id] = SyncScheduler(dataset)
+    return scheduler
+
+
+@contextlib.asynccontextmanager
+async def scheduler_lifespan():
+    """Lifespan task that stops every sync scheduler when the backend shuts down."""
+    try:
+        yield
+    finally:
+        for scheduler in list(_schedulers.values()):
+            await scheduler.stop()
+        _schedulers.clear()
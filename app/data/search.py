@@ -0,0 +1,84 @@
+import re
+from collections import defaultdict
+from typing import Iterable
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_TOKEN_RE.findall(text.lower()))
+
+
+def _prefixes(text: str) -> set[str]:
+    return {word[:end] for word in text.split() for end in range(1, len(word) + 1)}
+
+
+class SearchIndex:
+    """In-memory index for roster search over names and custom field values.
+
+    Names are indexed by every prefix of each of their words, and field values
+    by word in an inverted index, so each query word is answered with a single
+    dictionary lookup. A query matches a person when every query word starts a
+    word of their name or is a word of one of their field values.
+    """
+
+    def __init__(self):
+        self._names: dict[str, str] = {}
+        self._field_tokens: dict[str, set[str]] = {}
+        self._name_prefixes: dict[str, set[str]] = defaultdict(set)
+        self._field_index: dict[str, set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, person_id: str, name: str, field_values: Iterable[str] = ()):
+        """Index a person, replacing anything indexed for them before."""
+        self.remove(person_id)
+        normalized = _normalize(name)
+        self._names[person_id] = normalized
+        for prefix in _prefixes(normalized):
+            self._name_prefixes[prefix].add(person_id)
+        tokens = {
+            token for value in field_values for token in _normalize(value).split()
+        }
+        self._field_tokens[person_id] = tokens
+        for token in tokens:
+            self._field_index[token].add(person_id)
+
+    def remove(self, person_id: str):
+        """Drop a person from the index."""
+        normalized = self._names.pop(person_id, None)
+        if normalized is None:
+            return
+        for prefix in _prefixes(normalized):
+            self._discard(self._name_prefixes, prefix, person_id)
+        for token in self._field_tokens.pop(person_id, ()):
+            self._discard(self._field_index, token, person_id)
+
+    @staticmethod
+    def _discard(index: dict[str, set[str]], key: str, person_id: str):
+        postings = index.get(key)
+        if postings is not None:
+            postings.discard(person_id)
+            if not postings:
+                del index[key]
+
+    def _word_matches(self, word: str) -> set[str]:
+        name_matches = self._name_prefixes.get(word)
+        field_matches = self._field_index.get(word)
+        if name_matches and field_matches:
+            return name_matches | field_matches
+        return name_matches or field_matches or set()
+
+    def search(self, query: str) -> set[str]:
+        """Return the ids of people matching every word of the query.
+
+        The returned set may be shared with the index and must not be mutated.
+        """
+        words = _normalize(query).split()
+        postings = sorted(map(self._word_matches, words), key=len)
+        if not postings:
+            return set(self._names)
+        if len(postings) == 1:
+            return postings[0]
+        return postings[0].intersection(*postings[1:])
@@ -0,0 +1,203 @@
+import os
+import sqlite3
+import threading
+from app.api.sync import SyncCursor
+
+SNAPSHOT_DB_PATH = os.getenv("PCO_SNAPSHOT_DB", "pco_snapshot.db")
+
+RESOURCE_COLUMNS = {
+    "people": ("id", "name", "status", "avatar", "created_at"),
+    "teams": ("id", "name"),
+    "team_positions": ("id", "team_id", "person_id"),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS people (
+    org_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    avatar TEXT NOT NULL,
+    created_at TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (org_id, id)
+);
+CREATE TABLE IF NOT EXISTS teams (
+    org_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (org_id, id)
+);
+CREATE TABLE IF NOT EXISTS team_positions (
+    org_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    team_id TEXT NOT NULL,
+    person_id TEXT NOT NULL,
+    PRIMARY KEY (org_id, id)
+);
+CREATE INDEX IF NOT EXISTS team_positions_team_id ON team_positions (org_id, team_id);
+CREATE INDEX IF NOT EXISTS team_positions_person_id ON team_positions (org_id, person_id);
+CREATE TABLE IF NOT EXISTS field_data (
+    org_id TEXT NOT NULL,
+    person_id TEXT NOT NULL,
+    field_definition_id TEXT NOT NULL,
+    field_name TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (org_id, person_id, field_definition_id)
+);
+CREATE INDEX IF NOT EXISTS field_data_field_definition_id ON field_data (org_id, field_definition_id);
+CREATE TABLE IF NOT EXISTS sync_cursors (
+    org_id TEXT NOT NULL,
+    resource TEXT NOT NULL,
+    watermark TEXT NOT NULL,
+    last_full_sync REAL NOT NULL,
+    last_deletion_check REAL NOT NULL,
+    PRIMARY KEY (org_id, resource)
+);
+"""
+
+
+class SnapshotStore:
+    """SQLite snapshot of each organization's people, teams and field data.
+
+    Calls are synchronous and serialized on one connection; run them with
+    ``asyncio.to_thread`` from event handlers.
+    """
+
+    def __init__(self, path: str = SNAPSHOT_DB_PATH):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            self._migrate()
+
+    def _migrate(self):
+        """Bring a snapshot database created by an older version up to date.
+
+        Stored people lack the new column's values, so their cursor is dropped
+        and the next sync pulls every person again.
+        """
+        people_columns = {
+            row["name"] for row in self._conn.execute("PRAGMA table_info(people)")
+        }
+        if "created_at" not in people_columns:
+            self._conn.execute(
+                "ALTER TABLE people ADD COLUMN created_at TEXT NOT NULL DEFAULT ''"
+            )
+            self._conn.execute("DELETE FROM sync_cursors WHERE resource = 'people'")
+        team_columns = {
+            row["name"] for row in self._conn.execute("PRAGMA table_info(teams)")
+        }
+        if "volunteer_count" in team_columns and sqlite3.sqlite_version_info >= (3, 35):
+            self._conn.execute("ALTER TABLE teams DROP COLUMN volunteer_count")
+
+    def load_rows(self, org_id: str, resource: str) -> list[dict]:
+        """Return every stored row of a resource for an organization."""
+        columns = RESOURCE_COLUMNS[resource]
+        with self._lock:
+            cursor = self._conn.execute(
+                f"SELECT {', '.join(columns)} FROM {resource} WHERE org_id = ? ORDER BY rowid",
+                (org_id,),
+            )
+            return [dict(row) for row in cursor]
+
+    def save_rows(
+        self,
+        org_id: str,
+        resource: str,
+        rows: list[dict],
+        removed_ids: list[str] | None = None,
+        replace: bool = False,
+    ):
+        """Upsert rows of a resource, deleting removed ids or, with ``replace``, all others."""
+        columns = RESOURCE_COLUMNS[resource]
+        placeholders = ", ".join("?" for _ in range(len(columns) + 1))
+        with self._lock, self._conn:
+            if replace:
+                self._conn.execute(f"DELETE FROM {resource} WHERE org_id = ?", (org_id,))
+            elif removed_ids:
+                self._conn.executemany(
+                    f"DELETE FROM {resource} WHERE org_id = ? AND id = ?",
+                    [(org_id, row_id) for row_id in removed_ids],
+                )
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {resource} (org_id, {', '.join(columns)}) VALUES ({placeholders})",
+                [(org_id, *(row[column] for column in columns)) for row in rows],
+            )
+
+    def load_field_data(self, org_id: str) -> list[tuple[str, str, str, str]]:
+        """Return stored ``(person_id, field_definition_id, field_name, value)`` rows."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT person_id, field_definition_id, field_name, value FROM field_data WHERE org_id = ?",
+                (org_id,),
+            )
+            return [tuple(row) for row in cursor]
+
+    def save_field_data(
+        self,
+        org_id: str,
+        rows: list[tuple[str, str, str, str]],
+        field_definition_ids: list[str],
+        replace: bool = False,
+    ):
+        """Upsert ``(person_id, field_definition_id, field_name, value)`` rows.
+
+        Stored data for definitions not in ``field_definition_ids`` is dropped,
+        and with ``replace`` so is everything else not in ``rows``.
+        """
+        with self._lock, self._conn:
+            if replace:
+                self._conn.execute("DELETE FROM field_data WHERE org_id = ?", (org_id,))
+            else:
+                self._conn.execute(
+                    f"DELETE FROM field_data WHERE org_id = ? AND field_definition_id NOT IN ({', '.join('?' for _ in field_definition_ids)})",
+                    (org_id, *field_definition_ids),
+                )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO field_data (org_id, person_id, field_definition_id, field_name, value) VALUES (?, ?, ?, ?, ?)",
+                [(org_id, *row) for row in rows],
+            )
+
+    def load_cursors(self, org_id: str) -> dict[str, SyncCursor]:
+        """Return the stored sync cursors of an organization, keyed by resource."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT resource, watermark, last_full_sync, last_deletion_check FROM sync_cursors WHERE org_id = ?",
+                (org_id,),
+            )
+            return {
+                row["resource"]: {
+                    "watermark": row["watermark"],
+                    "last_full_sync": row["last_full_sync"],
+                    "last_deletion_check": row["last_deletion_check"],
+                }
+                for row in cursor
+            }
+
+    def save_cursor(self, org_id: str, resource: str, cursor: SyncCursor):
+        """Store the sync cursor of one resource."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_cursors (org_id, resource, watermark, last_full_sync, last_deletion_check) VALUES (?, ?, ?, ?, ?)",
+                (
+                    org_id,
+                    resource,
+                    cursor["watermark"],
+                    cursor["last_full_sync"],
+                    cursor["last_deletion_check"],
+                ),
+            )
+
+
+_store: SnapshotStore | None = None
+
+
+def get_store() -> SnapshotStore:
+    """Return the process-wide snapshot store, opening it on first use."""
+    global _store
+    if _store is None:
+        _store = SnapshotStore()
+    return _store
@@ -24,7 +24,11 @@ def overview_metric_card(title: str, value: str, icon: str) -> rx.Component:
 def volunteer_card(person: Person) -> rx.Component:
     """Card to display a single volunteer."""
     return rx.el.div(
-        rx.el.img(src=person["avatar"], class_name="h-16 w-16 rounded-full mx-auto"),
+        rx.el.img(
+            src=person["avatar"],
+            loading="lazy",
+            class_name="h-16 w-16 rounded-full mx-auto",
+        ),
         rx.el.p(
             person["name"],
             class_name="mt-2 text-sm font-semibold text-gray-800 text-center truncate",
@@ -43,7 +47,45 @@ def volunteer_card(person: Person) -> rx.Component:
             ),
             class_name="mt-2 space-y-1",
         ),
-        class_name="bg-white p-4 rounded-xl border border-gray-100 shadow-sm",
+        class_name="h-52 overflow-hidden bg-white p-4 rounded-xl border border-gray-100 shadow-sm",
+    )
+
+
+def sync_progress() -> rx.Component:
+    """Progress of a people download that is streaming into the roster."""
+    return rx.cond(
+        PeopleState.sync_total > 0,
+        rx.el.div(
+            rx.el.p(
+                f"Loading people: {PeopleState.sync_loaded} / {PeopleState.sync_total}",
+                class_name="text-sm text-gray-500 mb-2",
+            ),
+            rx.el.div(
+                rx.el.div(
+                    class_name="h-2 bg-teal-500 rounded-full transition-all",
+                    style={"width": f"{PeopleState.sync_percent}%"},
+                ),
+                class_name="h-2 bg-gray-100 rounded-full",
+            ),
+            class_name="mb-6",
+        ),
+    )
+
+
+def volunteer_roster() -> rx.Component:
+    """Virtualized volunteer roster that only mounts the cards in view."""
+    return rx.el.div(
+        rx.el.div(style={"height": PeopleState.roster_top_spacer}),
+        rx.el.div(
+            rx.foreach(PeopleState.people_window, volunteer_card),
+            id="volunteer-roster-grid",
+            class_name="grid grid-cols-2 md:grid-cols-4 lg:grid-cols-6 gap-4",
+        ),
+        rx.el.div(style={"height": PeopleState.roster_bottom_spacer}),
+        id="volunteer-roster",
+        on_mount=PeopleState.measure_roster,
+        on_scroll=PeopleState.measure_roster.throttle(150),
+        class_name="max-h-[70vh] overflow-y-auto",
     )
 
 
@@ -91,12 +133,13 @@ def people_page() -> rx.Component:
             header(),
             rx.el.div(
                 rx.cond(
-                    PeopleState.is_loading,
+                    PeopleState.is_loading & (PeopleState.total_volunteers == 0),
                     rx.el.div(
                         rx.spinner(size="3"),
                         class_name="flex justify-center items-center h-[80vh]",
                     ),
                     rx.el.div(
+                        sync_progress(),
                         rx.el.div(
                             overview_metric_card(
                                 "Total Volunteers",
@@ -112,14 +155,43 @@ def people_page() -> rx.Component:
                         ),
                         rx.el.div(
                             rx.el.div(
-                                rx.el.h3(
-                                    "Volunteer Roster",
-                                    class_name="text-lg font-semibold text-gray-700 mb-4",
-                                ),
                                 rx.el.div(
-                                    rx.foreach(PeopleState.all_people, volunteer_card),
-                                    class_name="grid grid-cols-2 md:grid-cols-4 lg:grid-cols-6 gap-4",
+                                    rx.el.h3(
+                                        "Volunteer Roster",
+                                        class_name="text-lg font-semibold text-gray-700",
+                                    ),
+                                    rx.el.div(
+                                        rx.el.p(
+                                            f"{PeopleState.roster_count} of {PeopleState.total_volunteers}",
+                                            class_name="text-sm text-gray-500",
+                                        ),
+                                        rx.el.select(
+                                            rx.el.option("API order", value=""),
+                                            rx.el.option("Name", value="name"),
+                                            rx.el.option("Join date", value="join_date"),
+                                            rx.el.option("Team", value="team"),
+                                            default_value=PeopleState.sort_key,
+                                            on_change=PeopleState.set_sort_key,
+                                            class_name="bg-white border border-gray-300 rounded-lg px-3 py-1 text-sm focus:outline-none focus:ring-2 focus:ring-teal-500",
+                                        ),
+                                        rx.el.button(
+                                            rx.icon("refresh-cw", class_name="h-4 w-4"),
+                                            on_click=PeopleState.refresh_data,
+                                            class_name="p-2 rounded-lg border border-gray-200 hover:bg-gray-100",
+                                        ),
+                                        rx.el.input(
+                                            placeholder="Search name or field...",
+                                            default_value=PeopleState.search_query,
+                                            on_change=PeopleState.set_search_query.debounce(
+                                                200
+                                            ),
+                                            class_name="bg-gray-100 border border-gray-200 rounded-lg px-3 py-1 text-sm focus:outline-none focus:ring-2 focus:ring-teal-500",
+                                        ),
+                                        class_name="flex items-center gap-4",
+                                    ),
+                                    class_name="flex justify-between items-center mb-4",
                                 ),
+                                volunteer_roster(),
                                 class_name="bg-white p-6 rounded-xl border border-gray-100 shadow-sm",
                             ),
                             team_composition_chart(PeopleState.team_composition),
@@ -3,7 +3,7 @@ import os
 from typing import Optional
 import httpx
 
-API_BASE_URL = "https://api.planningcenteronline.com"
+API_BASE_URL = os.getenv("PCO_API_BASE_URL", "https://api.planningcenteronline.com")
 AUTHORIZE_URL = f"{API_BASE_URL}/oauth/authorize"
 TOKEN_URL = f"{API_BASE_URL}/oauth/token"
 REDIRECT_URI = "http://localhost:3000/callback"
@@ -59,7 +59,11 @@ class AuthState(rx.State):
 
     @rx.event
     def logout(self):
-        """Log the user out by clearing the token."""
+        """Log the user out by clearing the token and stopping syncs that use it."""
+        from app.data.scheduler import forget_token
+
+        if self.access_token:
+            forget_token(self.access_token)
         self.access_token = None
         self.is_authenticated = False
         return rx.redirect("/login")
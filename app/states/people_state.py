@@ -1,10 +1,28 @@
 import reflex as rx
+import asyncio
+import math
 from typing import TypedDict
 import httpx
 import logging
-from app.states.auth_state import AuthState, API_BASE_URL
+from app.states.profiling import profiled
 from app.states.settings_state import SettingsState
-from collections import defaultdict
+from app.api.avatars import avatar_url
+from app.api.client import get_access_token, get_client, get_organization_id
+from app.states.state import AppState
+from app.data.dataset import SORT_KEYS, OrgDataset, get_dataset
+from app.data.scheduler import get_scheduler
+
+ROSTER_PAGE_SIZE = 48
+ROSTER_ROW_HEIGHT = 224  # h-52 volunteer card plus the gap-4 row gap
+ROSTER_OVERSCAN_ROWS = 2
+PROGRESS_INTERVAL = 0.5
+ROSTER_VIEWPORT_SCRIPT = """(() => {
+  const roster = document.getElementById("volunteer-roster");
+  const grid = document.getElementById("volunteer-roster-grid");
+  if (!roster || !grid) return [0, 0, 1];
+  const columns = getComputedStyle(grid).gridTemplateColumns.split(" ").length;
+  return [Math.floor(roster.scrollTop), roster.clientHeight, columns];
+})()"""
 
 
 class Person(TypedDict):
@@ -12,213 +30,194 @@ class Person(TypedDict):
     name: str
     status: str
     avatar: str
+    created_at: str
     field_data: dict[str, str]
 
 
-class Team(TypedDict):
-    id: str
-    name: str
-    volunteer_count: int
-
-
-class TeamPosition(TypedDict):
-    id: str
-    team_id: str
-    person_id: str
-
-
 class TeamComposition(TypedDict):
     name: str
     value: int
 
 
 class PeopleState(rx.State):
-    """Manages state for the people and teams analytics page."""
-
-    all_people: list[Person] = []
-    all_teams: list[Team] = []
-    team_positions: list[TeamPosition] = []
+    """Manages state for the people and teams analytics page.
+
+    The full dataset lives in the organization's shared ``OrgDataset``; this
+    state only holds the current roster window and aggregates.
+    """
+
+    people_window: list[Person] = []
+    window_start: int = 0
+    window_size: int = ROSTER_PAGE_SIZE
+    roster_columns: int = 1
+    roster_count: int = 0
+    search_query: str = ""
+    sort_key: str = ""
+    total_volunteers: int = 0
+    total_teams: int = 0
+    team_composition: list[TeamComposition] = []
     is_loading: bool = False
-
-    async def _get_authed_client(self) -> httpx.AsyncClient | None:
-        token = None
+    sync_loaded: int = 0
+    sync_total: int = 0
+    _org_id: str = ""
+
+    async def _get_dataset(self) -> tuple[str, OrgDataset] | None:
+        token = await get_access_token(self)
+        if token is None:
+            return None
+        org_id = await get_organization_id(get_client(token))
         async with self:
-            auth_state = await self.get_state(AuthState)
-            if not auth_state.is_authenticated or not auth_state.access_token:
-                return None
-            token = auth_state.access_token
-        return httpx.AsyncClient(headers={"Authorization": f"Bearer {token}"})
+            self._org_id = org_id
+        return token, get_dataset(org_id)
+
+    async def _refresh_window(self, dataset: OrgDataset):
+        """Copy the current roster window out of the dataset."""
+        settings = await self.get_state(SettingsState)
+        positions = dataset.view(self.search_query, self.sort_key)
+        self.roster_count = dataset.view_size(positions)
+        columns = self.roster_columns
+        last_start = max(0, self.roster_count - 1) // columns * columns
+        self.window_start = min(max(0, self.window_start), last_start)
+        window = dataset.person_window(
+            self.window_start,
+            self.window_start + self.window_size,
+            list(settings.selected_field_ids),
+            positions,
+        )
+        for person in window:
+            person["avatar"] = avatar_url(person["avatar"])
+        self.people_window = window
+
+    async def _refresh_view(self, dataset: OrgDataset):
+        """Copy the roster window and the aggregate counts out of the dataset."""
+        await self._refresh_window(dataset)
+        self.total_volunteers = len(dataset.people)
+        self.total_teams = len(dataset.teams)
+        self.team_composition = dataset.team_composition()
+        self.sync_loaded, self.sync_total = dataset.sync_progress("people") or (0, 0)
 
     @rx.event(background=True)
+    @profiled
     async def on_load(self):
-        """Load all people and team data when the page loads."""
+        """Show the organization's cached data and register it for background sync."""
         async with self:
             self.is_loading = True
-        yield PeopleState.fetch_all_people
-        yield PeopleState.fetch_all_teams
-        yield PeopleState.fetch_team_positions
-        async with self:
-            self.is_loading = False
-
-    @rx.event(background=True)
-    async def fetch_all_people(self):
-        """Fetch all active people from the Planning Center API with pagination."""
-        client = await self._get_authed_client()
-        if client is None:
-            return
-        all_people_data = []
-        next_url = f"{API_BASE_URL}/people/v2/people?where[status]=active&per_page=100"
         try:
-            async with client:
-                while next_url:
-                    response = await client.get(next_url)
-                    response.raise_for_status()
-                    json_response = response.json()
-                    all_people_data.extend(json_response.get("data", []))
-                    next_url = json_response.get("links", {}).get("next")
-            temp_people = []
-            for item in all_people_data:
-                person_id = item["id"]
-                field_data = await self._fetch_field_data_for_person(client, person_id)
-                temp_people.append(
-                    {
-                        "id": person_id,
-                        "name": item["attributes"]["name"],
-                        "status": item["attributes"]["status"],
-                        "avatar": item["attributes"]["avatar"],
-                        "field_data": field_data,
-                    }
-                )
+            await self._load(force=False)
+        finally:
             async with self:
-                self.all_people = temp_people
-        except httpx.HTTPStatusError as e:
-            logging.exception(f"Error fetching people: {e}")
-        except Exception as e:
-            logging.exception(
-                f"An unexpected error occurred while fetching people: {e}"
-            )
+                self.is_loading = False
 
     @rx.event(background=True)
-    async def fetch_all_teams(self):
-        """Fetch all teams from the Planning Center API with pagination."""
-        client = await self._get_authed_client()
-        if client is None:
-            return
-        all_teams_data = []
-        next_url = f"{API_BASE_URL}/people/v2/teams?per_page=100"
-        try:
-            async with client:
-                while next_url:
-                    response = await client.get(next_url)
-                    response.raise_for_status()
-                    json_response = response.json()
-                    all_teams_data.extend(json_response.get("data", []))
-                    next_url = json_response.get("links", {}).get("next")
-            async with self:
-                self.all_teams = [
-                    {
-                        "id": item["id"],
-                        "name": item["attributes"]["name"],
-                        "volunteer_count": 0,
-                    }
-                    for item in all_teams_data
-                ]
-        except httpx.HTTPStatusError as e:
-            logging.exception(f"Error fetching teams: {e}")
-        except Exception as e:
-            logging.exception(f"An unexpected error occurred while fetching teams: {e}")
+    @profiled
+    async def refresh_data(self):
+        """Sync the organization's dataset now and show the result."""
+        await self._load(force=True)
 
-    @rx.event(background=True)
-    async def fetch_team_positions(self):
-        """Fetch all team positions to link people to teams with pagination."""
-        client = await self._get_authed_client()
-        if client is None:
-            return
-        all_positions_data = []
-        next_url = f"{API_BASE_URL}/people/v2/team_positions?per_page=100"
+    async def _load(self, force: bool):
         try:
-            async with client:
-                while next_url:
-                    response = await client.get(next_url)
-                    response.raise_for_status()
-                    json_response = response.json()
-                    all_positions_data.extend(json_response.get("data", []))
-                    next_url = json_response.get("links", {}).get("next")
+            loaded = await self._get_dataset()
+            if loaded is None:
+                return
+            token, dataset = loaded
+            await dataset.load_snapshot()
             async with self:
-                self.team_positions = [
-                    {
-                        "id": item["id"],
-                        "team_id": item["relationships"]["team"]["data"]["id"],
-                        "person_id": item["relationships"]["person"]["data"]["id"],
-                    }
-                    for item in all_positions_data
-                    if item.get("relationships", {}).get("person")
-                ]
+                await self._refresh_view(dataset)
+                settings = await self.get_state(SettingsState)
+                app_state = await self.get_state(AppState)
+                selected_field_ids = list(settings.selected_field_ids)
+                sync_interval = int(app_state.sync_interval or 0)
+            scheduler = get_scheduler(dataset)
+            scheduler.configure(token, sync_interval, selected_field_ids)
+            if force or scheduler.needs_sync():
+                run = scheduler.run_once()
+                while not run.done():
+                    await asyncio.wait({run}, timeout=PROGRESS_INTERVAL)
+                    async with self:
+                        await self._refresh_view(dataset)
         except httpx.HTTPStatusError as e:
-            logging.exception(f"Error fetching team positions: {e}")
+            logging.exception(f"Error loading people: {e}")
         except Exception as e:
             logging.exception(
-                f"An unexpected error occurred while fetching team positions: {e}"
+                f"An unexpected error occurred while loading people: {e}"
             )
 
-    async def _fetch_field_data_for_person(
-        self, client: httpx.AsyncClient, person_id: str
-    ) -> dict[str, str]:
-        """Fetch and process field data for a single person based on selected definitions."""
-        settings = await self.get_state(SettingsState)
-        if not settings.selected_field_ids:
-            return {}
-        field_data_map = {}
-        try:
-            field_data_url = f"{API_BASE_URL}/people/v2/people/{person_id}/field_data?include=field_definition"
-            response = await client.get(field_data_url)
-            response.raise_for_status()
-            json_response = response.json()
-            included_defs = {
-                item["id"]: item["attributes"]["name"]
-                for item in json_response.get("included", [])
-                if item["type"] == "FieldDefinition"
-            }
-            for datum in json_response.get("data", []):
-                field_def_id = datum["relationships"]["field_definition"]["data"]["id"]
-                if field_def_id in settings.selected_field_ids:
-                    field_name = included_defs.get(field_def_id)
-                    if field_name:
-                        value = datum["attributes"].get("value", "N/A")
-                        field_data_map[field_name] = str(value)
-        except httpx.HTTPStatusError as e:
-            logging.exception(f"Error fetching field data for person {person_id}: {e}")
-        except Exception as e:
-            logging.exception(
-                f"Unexpected error fetching field data for person {person_id}: {e}"
-            )
-        return field_data_map
+    @rx.event
+    @profiled
+    async def set_search_query(self, query: str):
+        """Filter the roster to people matching a search query."""
+        self.search_query = query
+        self.window_start = 0
+        if self._org_id:
+            await self._refresh_window(get_dataset(self._org_id))
+
+    @rx.event
+    @profiled
+    async def set_sort_key(self, sort_key: str):
+        """Sort the roster by name, join date or team, or in API order."""
+        self.sort_key = sort_key if sort_key in SORT_KEYS else ""
+        self.window_start = 0
+        if self._org_id:
+            await self._refresh_window(get_dataset(self._org_id))
+
+    @rx.event
+    def measure_roster(self):
+        """Ask the browser for the roster's scroll position and column count."""
+        return rx.call_script(
+            ROSTER_VIEWPORT_SCRIPT, callback=PeopleState.set_roster_viewport
+        )
+
+    @rx.event
+    @profiled
+    async def set_roster_viewport(self, viewport: list[int]):
+        """Window the roster to the rows visible at the given scroll position.
+
+        Only the visible rows plus ``ROSTER_OVERSCAN_ROWS`` above and below are
+        mounted; spacers stand in for the rest so the scrollbar still reflects
+        the whole roster.
+        """
+        # scrollTop is fractional on scaled displays and Reflex does not coerce
+        # the payload to the annotated ints.
+        scroll_top, height, columns = (int(value) for value in viewport)
+        columns = max(1, columns)
+        first_row = max(0, scroll_top // ROSTER_ROW_HEIGHT - ROSTER_OVERSCAN_ROWS)
+        visible_rows = math.ceil(height / ROSTER_ROW_HEIGHT) + 2 * ROSTER_OVERSCAN_ROWS
+        window_start = first_row * columns
+        window_size = max(1, visible_rows) * columns
+        if (window_start, window_size, columns) == (
+            self.window_start,
+            self.window_size,
+            self.roster_columns,
+        ):
+            return
+        self.window_start = window_start
+        self.window_size = window_size
+        self.roster_columns = columns
+        if self._org_id:
+            await self._refresh_window(get_dataset(self._org_id))
+
+    @rx.var
+    def window_end(self) -> int:
+        """Returns the index just past the last person in the roster window."""
+        return self.window_start + len(self.people_window)
 
     @rx.var
-    def total_volunteers(self) -> int:
-        """Returns the total number of active volunteers."""
-        return len(self.all_people)
+    def sync_percent(self) -> int:
+        """Returns how much of a full people download has arrived, in percent."""
+        if not self.sync_total:
+            return 0
+        return min(100, self.sync_loaded * 100 // self.sync_total)
 
     @rx.var
-    def total_teams(self) -> int:
-        """Returns the total number of teams."""
-        return len(self.all_teams)
+    def roster_top_spacer(self) -> str:
+        """Returns the height standing in for the rows above the window."""
+        return f"{self.window_start // self.roster_columns * ROSTER_ROW_HEIGHT}px"
 
     @rx.var
-    def team_composition(self) -> list[TeamComposition]:
-        """Calculates the number of volunteers per team."""
-        if not self.all_teams or not self.team_positions:
-            return []
-        team_counts = defaultdict(int)
-        team_id_to_name = {team["id"]: team["name"] for team in self.all_teams}
-        active_person_ids = {person["id"] for person in self.all_people}
-        for position in self.team_positions:
-            if position["person_id"] in active_person_ids:
-                team_name = team_id_to_name.get(position["team_id"])
-                if team_name:
-                    team_counts[team_name] += 1
-        return sorted(
-            [{"name": name, "value": count} for name, count in team_counts.items()],
-            key=lambda x: x["value"],
-            reverse=True,
-        )
\ No newline at end of file
+    def roster_bottom_spacer(self) -> str:
+        """Returns the height standing in for the rows below the window."""
+        columns = self.roster_columns
+        hidden_rows = math.ceil(self.roster_count / columns) - math.ceil(
+            self.window_end / columns
+        )
+        return f"{max(0, hidden_rows) * ROSTER_ROW_HEIGHT}px"
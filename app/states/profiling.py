@@ -0,0 +1,265 @@
+import functools
+import inspect
+import os
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, TypedDict
+import reflex as rx
+from reflex.app import EventNamespace
+from reflex.istate.proxy import StateProxy
+from reflex.utils.format import json_dumps
+from reflex.vars.base import ComputedVar
+
+PROFILE_HANDLERS = os.getenv("PCO_PROFILE_HANDLERS", "0") == "1"
+
+
+class HandlerProfile(TypedDict):
+    handler: str
+    calls: int
+    total_seconds: float
+    max_seconds: float
+    lock_wait_seconds: float
+    lock_held_seconds: float
+    computed_var_seconds: float
+    deltas: int
+    delta_bytes: int
+    max_delta_bytes: int
+
+
+class ComputedVarProfile(TypedDict):
+    var: str
+    evaluations: int
+    total_seconds: float
+    max_seconds: float
+
+
+class _Call:
+    """What one event handler invocation spent, filled in while it runs."""
+
+    __slots__ = (
+        "lock_wait",
+        "lock_held",
+        "lock_entered",
+        "computed",
+        "deltas",
+        "delta_bytes",
+        "max_delta_bytes",
+    )
+
+    def __init__(self):
+        self.lock_wait = 0.0
+        self.lock_held = 0.0
+        self.lock_entered: list[float] = []
+        self.computed = 0.0
+        self.deltas = 0
+        self.delta_bytes = 0
+        self.max_delta_bytes = 0
+
+    def add_delta(self, size: int):
+        self.deltas += 1
+        self.delta_bytes += size
+        self.max_delta_bytes = max(self.max_delta_bytes, size)
+
+
+_current_call: ContextVar[_Call | None] = ContextVar("pco_profiled_call", default=None)
+_evaluating: ContextVar[bool] = ContextVar("pco_evaluating_var", default=False)
+_handlers: dict[str, HandlerProfile] = {}
+_computed_vars: dict[str, ComputedVarProfile] = {}
+_installed = False
+
+
+def _record(name: str, call: _Call, seconds: float):
+    profile = _handlers.get(name)
+    if profile is None:
+        profile = _handlers[name] = {
+            "handler": name,
+            "calls": 0,
+            "total_seconds": 0.0,
+            "max_seconds": 0.0,
+            "lock_wait_seconds": 0.0,
+            "lock_held_seconds": 0.0,
+            "computed_var_seconds": 0.0,
+            "deltas": 0,
+            "delta_bytes": 0,
+            "max_delta_bytes": 0,
+        }
+    profile["calls"] += 1
+    profile["total_seconds"] += seconds
+    profile["max_seconds"] = max(profile["max_seconds"], seconds)
+    profile["lock_wait_seconds"] += call.lock_wait
+    profile["lock_held_seconds"] += call.lock_held
+    profile["computed_var_seconds"] += call.computed
+    profile["deltas"] += call.deltas
+    profile["delta_bytes"] += call.delta_bytes
+    profile["max_delta_bytes"] = max(profile["max_delta_bytes"], call.max_delta_bytes)
+
+
+def _record_computed_var(name: str, seconds: float):
+    profile = _computed_vars.get(name)
+    if profile is None:
+        profile = _computed_vars[name] = {
+            "var": name,
+            "evaluations": 0,
+            "total_seconds": 0.0,
+            "max_seconds": 0.0,
+        }
+    profile["evaluations"] += 1
+    profile["total_seconds"] += seconds
+    profile["max_seconds"] = max(profile["max_seconds"], seconds)
+
+
+def _install():
+    """Wrap the Reflex internals that lock state, evaluate vars and emit deltas.
+
+    Background handlers take the state lock through ``StateProxy`` and emit
+    their deltas from inside it, so those are attributed to the handler whose
+    task is running. Only outermost computed var evaluations are timed, so
+    vars that read other computed vars are not counted twice.
+    """
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    enter, exit_, emit, get = (
+        StateProxy.__aenter__,
+        StateProxy.__aexit__,
+        EventNamespace.emit_update,
+        ComputedVar.__get__,
+    )
+
+    async def profiled_enter(proxy: StateProxy) -> StateProxy:
+        call = _current_call.get()
+        if call is None:
+            return await enter(proxy)
+        started = time.perf_counter()
+        result = await enter(proxy)
+        entered = time.perf_counter()
+        call.lock_wait += entered - started
+        call.lock_entered.append(entered)
+        return result
+
+    async def profiled_exit(proxy: StateProxy, *exc_info: Any):
+        call = _current_call.get()
+        try:
+            await exit_(proxy, *exc_info)
+        finally:
+            if call is not None and call.lock_entered:
+                call.lock_held += time.perf_counter() - call.lock_entered.pop()
+
+    async def profiled_emit(namespace: EventNamespace, update: Any, *args, **kwargs):
+        call = _current_call.get()
+        if call is not None:
+            call.add_delta(len(update.json().encode()))
+        return await emit(namespace, update, *args, **kwargs)
+
+    def profiled_get(var: ComputedVar, instance: Any, owner: Any = None):
+        if instance is None or _evaluating.get():
+            return get(var, instance, owner)
+        token = _evaluating.set(True)
+        started = time.perf_counter()
+        try:
+            return get(var, instance, owner)
+        finally:
+            seconds = time.perf_counter() - started
+            _evaluating.reset(token)
+            _record_computed_var(f"{type(instance).__name__}.{var._name}", seconds)
+            call = _current_call.get()
+            if call is not None:
+                call.computed += seconds
+
+    StateProxy.__aenter__ = profiled_enter
+    StateProxy.__aexit__ = profiled_exit
+    EventNamespace.emit_update = profiled_emit
+    ComputedVar.__get__ = profiled_get
+
+
+def _measure_delta(state: Any, call: _Call):
+    """Size the delta a regular handler leaves behind for Reflex to send."""
+    if not isinstance(state, rx.State) or isinstance(state, StateProxy):
+        return
+    started = time.perf_counter()
+    delta = state.get_delta()
+    call.computed += time.perf_counter() - started
+    if delta:
+        call.add_delta(len(json_dumps(delta).encode()))
+
+
+def profiled(handler: Callable) -> Callable:
+    """Record an event handler's timings and deltas when ``PCO_PROFILE_HANDLERS=1``.
+
+    Apply it beneath ``@rx.event``. With profiling off the handler is returned
+    unchanged.
+    """
+    if not PROFILE_HANDLERS:
+        return handler
+    _install()
+    name = handler.__qualname__
+
+    if inspect.isasyncgenfunction(handler):
+
+        @functools.wraps(handler)
+        async def profiled_handler(self, *args, **kwargs):
+            call = _Call()
+            token = _current_call.set(call)
+            started = time.perf_counter()
+            try:
+                async for event in handler(self, *args, **kwargs):
+                    yield event
+                _measure_delta(self, call)
+            finally:
+                _current_call.reset(token)
+                _record(name, call, time.perf_counter() - started)
+
+    elif inspect.iscoroutinefunction(handler):
+
+        @functools.wraps(handler)
+        async def profiled_handler(self, *args, **kwargs):
+            call = _Call()
+            token = _current_call.set(call)
+            started = time.perf_counter()
+            try:
+                result = await handler(self, *args, **kwargs)
+                _measure_delta(self, call)
+                return result
+            finally:
+                _current_call.reset(token)
+                _record(name, call, time.perf_counter() - started)
+
+    else:
+
+        @functools.wraps(handler)
+        def profiled_handler(self, *args, **kwargs):
+            call = _Call()
+            token = _current_call.set(call)
+            started = time.perf_counter()
+            try:
+                result = handler(self, *args, **kwargs)
+                _measure_delta(self, call)
+                return result
+            finally:
+                _current_call.reset(token)
+                _record(name, call, time.perf_counter() - started)
+
+    return profiled_handler
+
+
+def profile_report(sort_key: str = "total_seconds") -> dict:
+    """Return handler and computed var profiles, worst first by ``sort_key``.
+
+    Handlers can be ranked by any numeric ``HandlerProfile`` field; computed
+    vars are always ranked by total evaluation time.
+    """
+    if sort_key not in HandlerProfile.__annotations__ or sort_key == "handler":
+        sort_key = "total_seconds"
+    return {
+        "enabled": PROFILE_HANDLERS,
+        "sort": sort_key,
+        "handlers": sorted(
+            _handlers.values(), key=lambda profile: profile[sort_key], reverse=True
+        ),
+        "computed_vars": sorted(
+            _computed_vars.values(),
+            key=lambda profile: profile["total_seconds"],
+            reverse=True,
+        ),
+    }
@@ -2,7 +2,9 @@ import reflex as rx
 from typing import TypedDict, Optional
 import httpx
 import logging
-from app.states.auth_state import AuthState, API_BASE_URL
+from app.api.client import get_authed_client, get_organization_id
+from app.data.dataset import fetch_field_definitions
+from app.states.profiling import profiled
 
 
 class FieldDefinition(TypedDict):
@@ -17,16 +19,8 @@ class SettingsState(rx.State):
     selected_field_ids: list[str] = rx.LocalStorage([], name="selected_field_ids")
     is_loading: bool = False
 
-    async def _get_authed_client(self) -> httpx.AsyncClient | None:
-        token = None
-        async with self:
-            auth_state = await self.get_state(AuthState)
-            if not auth_state.is_authenticated or not auth_state.access_token:
-                return None
-            token = auth_state.access_token
-        return httpx.AsyncClient(headers={"Authorization": f"Bearer {token}"})
-
     @rx.event(background=True)
+    @profiled
     async def on_load(self):
         """Load field definitions when the settings page loads."""
         async with self:
@@ -36,29 +30,17 @@ class SettingsState(rx.State):
             self.is_loading = False
 
     @rx.event(background=True)
+    @profiled
     async def fetch_field_definitions(self):
         """Fetch all field definitions from the Planning Center API."""
-        client = await self._get_authed_client()
+        client = await get_authed_client(self)
         if client is None:
             return
-        all_defs_data = []
-        next_url = f"{API_BASE_URL}/people/v2/field_definitions?per_page=100"
         try:
-            async with client:
-                while next_url:
-                    response = await client.get(next_url)
-                    response.raise_for_status()
-                    json_response = response.json()
-                    all_defs_data.extend(json_response.get("data", []))
-                    next_url = json_response.get("links", {}).get("next")
+            org_id = await get_organization_id(client)
+            field_definitions = await fetch_field_definitions(client, org_id)
             async with self:
-                self.field_definitions = sorted(
-                    [
-                        {"id": item["id"], "name": item["attributes"]["name"]}
-                        for item in all_defs_data
-                    ],
-                    key=lambda x: x["name"],
-                )
+                self.field_definitions = field_definitions
         except httpx.HTTPStatusError as e:
             logging.exception(f"Error fetching field definitions: {e}")
         except Exception as e:
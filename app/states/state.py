@@ -2,7 +2,11 @@ import reflex as rx
 from typing import TypedDict
 import httpx
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime
+from app.api.client import get_authed_client, get_organization_id
+from app.data.growth import GrowthSeries, get_growth_series, range_start
+from app.data.metrics import evaluate_dashboard, metric_cards
+from app.states.profiling import profiled
 
 
 class NavItem(TypedDict):
@@ -66,20 +70,11 @@ class AppState(rx.State):
         },
     ]
     team_chart_data: list[ChartData] = []
+    growth_granularity: str = "month"
+    growth_range_days: str = "365"
     metric_trends: dict[str, MetricTrend] = {}
     insights: list[Insight] = []
 
-    async def _get_authed_client(self) -> httpx.AsyncClient | None:
-        from app.states.auth_state import AuthState
-
-        token = None
-        async with self:
-            auth_state = await self.get_state(AuthState)
-            if not auth_state.is_authenticated or not auth_state.access_token:
-                return None
-            token = auth_state.access_token
-        return httpx.AsyncClient(headers={"Authorization": f"Bearer {token}"})
-
     @rx.event
     def set_active_page(self, page: str):
         """Set the active page."""
@@ -100,7 +95,20 @@ class AppState(rx.State):
         """Set the data sync interval."""
         self.sync_interval = interval
 
+    @rx.event
+    def set_growth_granularity(self, granularity: str):
+        """Set the bucket size of the growth chart."""
+        self.growth_granularity = granularity
+        return AppState.update_growth_chart
+
+    @rx.event
+    def set_growth_range_days(self, days: str):
+        """Set how many days back the growth chart starts, or 0 for all time."""
+        self.growth_range_days = days
+        return AppState.update_growth_chart
+
     @rx.event(background=True)
+    @profiled
     async def on_load(self):
         """Check auth and load dashboard data."""
         from app.states.auth_state import AuthState
@@ -148,7 +156,10 @@ class AppState(rx.State):
     def _generate_insights(self):
         insights = []
         for metric in self.metrics:
-            if metric["title"] == "New Members (30d)" and int(metric["value"]) > 0:
+            if (
+                metric["title"] == "New Members (30d)"
+                and int(metric["value"].replace(",", "")) > 0
+            ):
                 insights.append(
                     {
                         "text": f"{metric['value']} new people joined in the last 30 days.",
@@ -158,58 +169,62 @@ class AppState(rx.State):
                 )
         self.insights = insights
 
+    def _set_growth_chart(self, series: GrowthSeries):
+        self.team_chart_data = series.series(
+            self.growth_granularity,
+            range_start(int(self.growth_range_days or 0)),
+            date.today(),
+        )
+
     @rx.event(background=True)
-    async def update_dashboard_metrics(self):
-        """Fetch all metrics for the dashboard from the Planning Center API."""
-        from app.states.auth_state import API_BASE_URL
+    @profiled
+    async def update_growth_chart(self):
+        """Rebin the growth chart for the selected granularity and range."""
+        client = await get_authed_client(self)
+        if client is None:
+            return
+        try:
+            org_id = await get_organization_id(client)
+            series = await get_growth_series(client, org_id)
+            async with self:
+                self._set_growth_chart(series)
+        except httpx.HTTPStatusError as e:
+            logging.exception(f"Error fetching growth series: {e}")
+        except Exception as e:
+            logging.exception(f"Unexpected error updating the growth chart: {e}")
 
+    @rx.event(background=True)
+    @profiled
+    async def update_dashboard_metrics(self):
+        """Evaluate every dashboard metric and the growth series concurrently."""
         async with self:
             self.dashboard_loading = True
-        client = await self._get_authed_client()
+        client = await get_authed_client(self)
         if client is None:
             async with self:
                 self.dashboard_loading = False
             return
         try:
-            async with client:
-                people_res = await client.get(
-                    f"{API_BASE_URL}/people/v2/people?where[status]=active&per_page=1"
-                )
-                people_res.raise_for_status()
-                total_volunteers = (
-                    people_res.json().get("meta", {}).get("total_count", 0)
-                )
-                thirty_days_ago = (
-                    datetime.utcnow() - timedelta(days=30)
-                ).isoformat() + "Z"
-                new_members_res = await client.get(
-                    f"{API_BASE_URL}/people/v2/people?where[created_at][gt]={thirty_days_ago}"
-                )
-                new_members_res.raise_for_status()
-                new_members_count = (
-                    new_members_res.json().get("meta", {}).get("total_count", 0)
-                )
+            org_id = await get_organization_id(client)
+            values, series = await evaluate_dashboard(client, org_id)
             async with self:
+                previous = {m["title"]: m["value"] for m in self.metrics}
                 self.previous_metrics = self.metrics
-                self.metrics = [
-                    {
-                        "title": "Total Volunteers",
-                        "value": f"{total_volunteers:,}",
-                        "icon": "users",
-                        "color": "text-teal-500",
-                    },
-                    {
-                        "title": "New Members (30d)",
-                        "value": str(new_members_count),
-                        "icon": "user-check",
-                        "color": "text-green-500",
-                    },
-                ]
+                self.metrics = metric_cards(values, previous)
                 self.last_updated = datetime.utcnow().strftime("%b %d, %Y %I:%M %p UTC")
                 self._calculate_trends()
                 self._generate_insights()
+                try:
+                    if series is not None:
+                        self._set_growth_chart(series)
+                except Exception as e:
+                    logging.exception(f"Error updating the growth chart: {e}")
                 self.dashboard_loading = False
         except httpx.HTTPStatusError as e:
             logging.exception(f"Error fetching dashboard metrics: {e}")
             async with self:
-                self.dashboard_loading = False
\ No newline at end of file
+                self.dashboard_loading = False
+        except Exception as e:
+            logging.exception(f"Unexpected error fetching dashboard metrics: {e}")
+            async with self:
+                self.dashboard_loading = False
@@ -0,0 +1,75 @@
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from benchmarks.runner import compare, run_benchmarks
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark People, Settings and Dashboard load times against "
+        "the local Planning Center simulator."
+    )
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000,100000",
+        help="Comma-separated organization sizes, in people.",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--latency", type=float, default=0.02, help="Seconds added to every request."
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=int,
+        default=0,
+        help="Simulator requests per period; 0 disables throttling.",
+    )
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument(
+        "--results",
+        help="Compare an existing results file instead of running the benchmark.",
+    )
+    parser.add_argument("--compare", help="Baseline results file to compare against.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative increase of a metric that counts as a regression.",
+    )
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--fields", default="", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        # Imported here so the app reads the worker's PCO_* environment.
+        from benchmarks.scenarios import run_scenario
+
+        field_ids = list(filter(None, args.fields.split(",")))
+        print(json.dumps(asyncio.run(run_scenario(args.worker, field_ids))))
+        return
+
+    logging.basicConfig(level=logging.INFO)
+    if args.results:
+        with open(args.results) as results_file:
+            results = json.load(results_file)
+    else:
+        sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+        results = run_benchmarks(sizes, args.seed, args.latency, args.rate_limit)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(baseline, results, args.threshold)
+        for regression in regressions:
+            logging.warning(f"Regression: {regression}")
+        if regressions:
+            sys.exit(1)
+        logging.info(f"No regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+import contextlib
+import json
+import logging
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Iterator
+import httpx
+
+SIMULATOR_STARTUP_TIMEOUT = 300.0
+WORKER_TIMEOUT = 1800.0
+CHURN = {"updates": 100, "additions": 10}
+# (step name, scenario, churn the organization first)
+STEPS = (
+    ("dashboard_cold", "dashboard", False),
+    ("field_definitions", "field_definitions", False),
+    ("people_cold", "people_load", False),
+    ("people_restart", "people_load", False),
+    ("people_refresh", "people_refresh", True),
+    ("dashboard_warm", "dashboard", False),
+)
+# Increases below these are reported but never flagged as regressions.
+NOISE_FLOORS = {
+    "wall_seconds": 0.05,
+    "requests": 0,
+    "bytes": 64 * 1024,
+    "peak_rss_bytes": 4 * 1024 * 1024,
+    "state_bytes": 0,
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def simulator(
+    people: int, seed: int, latency: float, rate_limit: int
+) -> Iterator[str]:
+    """Serve a synthetic organization from a subprocess and yield its base URL."""
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "pco_simulator",
+            "--port",
+            str(port),
+            "--people",
+            str(people),
+            "--seed",
+            str(seed),
+            "--latency",
+            str(latency),
+            "--rate-limit",
+            str(rate_limit),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + SIMULATOR_STARTUP_TIMEOUT
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"Simulator exited with code {process.returncode}")
+            with contextlib.suppress(httpx.TransportError):
+                if httpx.get(f"{base_url}/_simulator/stats").status_code == 200:
+                    break
+            if time.monotonic() > deadline:
+                raise RuntimeError("Simulator did not start in time")
+            time.sleep(0.2)
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def _field_definition_ids(base_url: str) -> list[str]:
+    response = httpx.get(
+        f"{base_url}/people/v2/field_definitions",
+        params={"per_page": 100},
+        headers={"Authorization": "Bearer benchmark-setup"},
+    )
+    response.raise_for_status()
+    return [item["id"] for item in response.json()["data"]]
+
+
+def _run_worker(
+    scenario: str, field_ids: list[str], base_url: str, directory: str
+) -> dict:
+    """Run one scenario in a fresh backend process sharing ``directory``'s caches."""
+    env = {
+        **os.environ,
+        "PCO_API_BASE_URL": base_url,
+        "PCO_SNAPSHOT_DB": os.path.join(directory, "snapshot.db"),
+        "PCO_HTTP_CACHE_DB": os.path.join(directory, "http_cache.db"),
+        "PCO_AVATAR_CACHE_DIR": os.path.join(directory, "avatars"),
+    }
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks",
+            "--worker",
+            scenario,
+            "--fields",
+            ",".join(field_ids),
+        ],
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=WORKER_TIMEOUT,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Scenario {scenario} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_size(people: int, seed: int, latency: float, rate_limit: int) -> dict:
+    """Run every step against a fresh organization of ``people`` people."""
+    results = {}
+    with simulator(people, seed, latency, rate_limit) as base_url:
+        field_ids = _field_definition_ids(base_url)
+        with tempfile.TemporaryDirectory(prefix="pco-benchmark-") as directory:
+            for step, scenario, churn in STEPS:
+                if churn:
+                    httpx.post(
+                        f"{base_url}/_simulator/churn", params=CHURN
+                    ).raise_for_status()
+                results[step] = _run_worker(scenario, field_ids, base_url, directory)
+                logging.info(f"{people} people, {step}: {format_result(results[step])}")
+    return results
+
+
+def run_benchmarks(
+    sizes: list[int], seed: int, latency: float, rate_limit: int
+) -> dict:
+    """Run the benchmark at every size and return the results document."""
+    return {
+        "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {"seed": seed, "latency": latency, "rate_limit": rate_limit},
+        "results": {
+            str(size): run_size(size, seed, latency, rate_limit) for size in sizes
+        },
+    }
+
+
+def format_result(result: dict) -> str:
+    return (
+        f"{result['wall_seconds']:.2f}s, {result['requests']} requests, "
+        f"{result['bytes'] / 1e6:.2f} MB received, "
+        f"{result['peak_rss_bytes'] / 1e6:.0f} MB peak RSS, "
+        f"{result['state_bytes'] / 1e3:.1f} kB state"
+    )
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """Return a description of every metric more than ``threshold`` worse.
+
+    Only sizes and steps present in both documents are compared; lower is
+    better for every metric.
+    """
+    regressions = []
+    for size, steps in current["results"].items():
+        for step, result in steps.items():
+            before = baseline["results"].get(size, {}).get(step)
+            if before is None:
+                continue
+            for metric, floor in NOISE_FLOORS.items():
+                old, new = before[metric], result[metric]
+                if new > old * (1 + threshold) and new - old > floor:
+                    change = f"+{(new - old) / old:.0%}" if old else "new"
+                    regressions.append(
+                        f"{size} people, {step}: {metric} {old} -> {new} ({change})"
+                    )
+    return regressions
@@ -0,0 +1,115 @@
+import json
+import resource
+import sys
+import time
+from datetime import date
+from typing import Awaitable, Callable, TypedDict
+from app.api.avatars import avatar_url
+from app.api.client import close_all_clients, get_client, get_organization_id
+from app.api.instrumentation import track_requests
+from app.data.dataset import fetch_field_definitions, get_dataset
+from app.data.growth import range_start
+from app.data.metrics import evaluate_dashboard, metric_cards
+from app.data.scheduler import get_scheduler
+from app.states.people_state import ROSTER_PAGE_SIZE
+
+BENCHMARK_TOKEN = "benchmark-token"
+
+
+class ScenarioResult(TypedDict):
+    wall_seconds: float
+    requests: int
+    bytes: int
+    peak_rss_bytes: int
+    state_bytes: int
+
+
+async def dashboard(field_ids: list[str]) -> dict:
+    """What ``AppState.update_dashboard_metrics`` computes and stores."""
+    client = get_client(BENCHMARK_TOKEN)
+    org_id = await get_organization_id(client)
+    values, series = await evaluate_dashboard(client, org_id)
+    if series is None:
+        raise RuntimeError("Growth series could not be fetched")
+    return {
+        "metrics": metric_cards(values, {}),
+        "team_chart_data": series.series("month", range_start(365), date.today()),
+    }
+
+
+async def field_definitions(field_ids: list[str]) -> dict:
+    """What ``SettingsState.fetch_field_definitions`` fetches and stores."""
+    client = get_client(BENCHMARK_TOKEN)
+    org_id = await get_organization_id(client)
+    return {"field_definitions": await fetch_field_definitions(client, org_id)}
+
+
+async def _people(field_ids: list[str], force: bool) -> dict:
+    """What ``PeopleState.on_load`` (or ``refresh_data`` when forced) stores."""
+    client = get_client(BENCHMARK_TOKEN)
+    org_id = await get_organization_id(client)
+    dataset = get_dataset(org_id)
+    await dataset.load_snapshot()
+    scheduler = get_scheduler(dataset)
+    scheduler.configure(BENCHMARK_TOKEN, 0, field_ids)
+    try:
+        if force or scheduler.needs_sync():
+            await scheduler.run_once()
+            failed = [t["name"] for t in scheduler.last_timings if t["status"] != "ok"]
+            if failed:
+                raise RuntimeError(f"Sync stages failed: {', '.join(failed)}")
+    finally:
+        await scheduler.stop()
+    positions = dataset.view()
+    window = dataset.person_window(0, ROSTER_PAGE_SIZE, field_ids, positions)
+    for person in window:
+        person["avatar"] = avatar_url(person["avatar"])
+    return {
+        "people_window": window,
+        "roster_count": dataset.view_size(positions),
+        "total_volunteers": len(dataset.people),
+        "total_teams": len(dataset.teams),
+        "team_composition": dataset.team_composition(),
+    }
+
+
+async def people_load(field_ids: list[str]) -> dict:
+    return await _people(field_ids, force=False)
+
+
+async def people_refresh(field_ids: list[str]) -> dict:
+    return await _people(field_ids, force=True)
+
+
+SCENARIOS: dict[str, Callable[[list[str]], Awaitable[dict]]] = {
+    "dashboard": dashboard,
+    "field_definitions": field_definitions,
+    "people_load": people_load,
+    "people_refresh": people_refresh,
+}
+
+
+def _peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+async def run_scenario(name: str, field_ids: list[str]) -> ScenarioResult:
+    """Run one scenario in this process and measure it.
+
+    ``state_bytes`` is the size of the JSON the handler's state vars would
+    serialize to, which bounds the first state delta sent to the browser.
+    """
+    started = time.perf_counter()
+    with track_requests() as stats:
+        state = await SCENARIOS[name](field_ids)
+    wall_seconds = time.perf_counter() - started
+    await close_all_clients()
+    return {
+        "wall_seconds": round(wall_seconds, 4),
+        "requests": stats.requests,
+        "bytes": stats.bytes,
+        "peak_rss_bytes": _peak_rss_bytes(),
+        "state_bytes": len(json.dumps(state, ensure_ascii=False).encode()),
+    }
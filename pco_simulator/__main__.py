@@ -0,0 +1,47 @@
+import argparse
+import logging
+import time
+import uvicorn
+from pco_simulator.generator import generate_org
+from pco_simulator.server import Simulator, create_app
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve a synthetic Planning Center organization locally."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--people", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds added to every request."
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="Random extra latency, in seconds."
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=int,
+        default=100,
+        help="Requests per period per token; 0 reports headers without throttling.",
+    )
+    parser.add_argument("--rate-period", type=float, default=20.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    base_url = f"http://{args.host}:{args.port}"
+    started = time.perf_counter()
+    org = generate_org(args.people, args.seed, base_url)
+    logging.info(
+        f"Generated {args.people} people in {time.perf_counter() - started:.1f}s; "
+        f"point the app at it with PCO_API_BASE_URL={base_url}"
+    )
+    simulator = Simulator(
+        org, args.latency, args.jitter, args.rate_limit, args.rate_period
+    )
+    uvicorn.run(create_app(simulator), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+
+FIRST_NAMES = (
+    "Aaron Abigail Adam Alicia Andre Anna Ben Bianca Caleb Carmen Chloe "
+    "Daniel Dana David Elena Eli Emma Ethan Faith Felix Grace Hannah Isaac "
+    "Isabel Jacob Jada James Joy Kevin Kim Leah Liam Lucas Maria Mateo Mia "
+    "Nathan Noah Olivia Paul Priya Rachel Ruth Samuel Sarah Sofia Thomas "
+    "Victor Zoe"
+).split()
+LAST_NAMES = (
+    "Adams Allen Baker Brooks Campbell Carter Chen Clark Davis Diaz Edwards "
+    "Evans Fisher Garcia Green Hall Harris Hughes Jackson Johnson Kim King "
+    "Lee Lewis Lopez Martin Moore Nguyen Okafor Parker Patel Perez Reed "
+    "Rivera Roberts Robinson Sanchez Scott Smith Taylor Thomas Turner "
+    "Walker Ward Williams Wilson Young"
+).split()
+MINISTRIES = (
+    "Worship Hospitality Kids Students Production Parking Greeters Prayer "
+    "Media Setup Care Outreach"
+).split()
+FIELD_DEFINITIONS = (
+    ("Campus", ("North", "South", "East", "West", "Online")),
+    ("T-Shirt Size", ("S", "M", "L", "XL", "XXL")),
+    ("Background Check", ("Cleared", "Pending", "Expired")),
+    ("Baptized", ("Yes", "No")),
+    ("Small Group", ("Tuesday Men", "Wednesday Women", "Young Adults", "Couples")),
+    ("Allergies", ("None", "Peanuts", "Gluten", "Dairy")),
+)
+HISTORY_YEARS = 10
+FIELD_DATUM_RATE = 0.35
+POSITIONS_PER_PERSON = 0.6
+PEOPLE_PER_TEAM = 50
+
+
+def _timestamp(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class Collection:
+    """Records of one JSON:API type, stored as flat lists.
+
+    Each record is ``[id, *attributes, *relationship ids]``; an empty
+    relationship id means the relationship is null. Filtered selections are
+    cached until the collection changes.
+    """
+
+    def __init__(
+        self,
+        type_name: str,
+        attributes: tuple[str, ...],
+        relationships: dict[str, str] | None = None,
+    ):
+        self.type = type_name
+        self.attributes = attributes
+        self.relationships = relationships or {}
+        names = ["id", *attributes, *(f"{name}_id" for name in self.relationships)]
+        self.columns = {name: i for i, name in enumerate(names)}
+        self.records: list[list[str]] = []
+        self._selections: dict[tuple, list[int]] = {}
+        self._ids: dict[str, int] | None = None
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def add(self, record: list[str]):
+        self.records.append(record)
+        self.changed()
+
+    def changed(self):
+        """Drop cached selections after records were added or modified."""
+        self._selections.clear()
+        self._ids = None
+
+    def find(self, record_id: str) -> list[str] | None:
+        if self._ids is None:
+            self._ids = {record[0]: i for i, record in enumerate(self.records)}
+        position = self._ids.get(record_id)
+        return None if position is None else self.records[position]
+
+    def select(self, where: Iterable[tuple[str, str, str]]) -> list[int]:
+        """Return the positions of records matching every ``(column, op, value)``.
+
+        Raises ``KeyError`` for a column the collection does not have.
+        """
+        key = tuple(sorted(where))
+        positions = self._selections.get(key)
+        if positions is None:
+            conditions = [(self.columns[name], op, value) for name, op, value in key]
+            positions = [
+                i
+                for i, record in enumerate(self.records)
+                if all(_matches(record[c], op, value) for c, op, value in conditions)
+            ]
+            if len(self._selections) >= 64:
+                self._selections.clear()
+            self._selections[key] = positions
+        return positions
+
+    def resource(self, record: list[str], fields: set[str] | None = None) -> dict:
+        """Render a record as a JSON:API resource object, keeping only ``fields``."""
+        attributes = {
+            name: record[self.columns[name]]
+            for name in self.attributes
+            if fields is None or name in fields
+        }
+        relationships = {}
+        for name, related_type in self.relationships.items():
+            if fields is not None and name not in fields:
+                continue
+            related_id = record[self.columns[f"{name}_id"]]
+            relationships[name] = {
+                "data": {"type": related_type, "id": related_id} if related_id else None
+            }
+        return {
+            "type": self.type,
+            "id": record[0],
+            "attributes": attributes,
+            "relationships": relationships,
+        }
+
+
+def _matches(actual: str, op: str, expected: str) -> bool:
+    if op == "eq":
+        return actual == expected
+    if op == "gt":
+        return actual > expected
+    if op == "gte":
+        return actual >= expected
+    if op == "lt":
+        return actual < expected
+    if op == "lte":
+        return actual <= expected
+    raise KeyError(op)
+
+
+class SyntheticOrg:
+    """A generated Planning Center organization, keyed by API collection name."""
+
+    def __init__(self, org_id: str, name: str, seed: int, base_url: str):
+        self.id = org_id
+        self.name = name
+        self.base_url = base_url
+        self.random = random.Random(seed)
+        self.collections = {
+            "people": Collection(
+                "Person", ("name", "status", "avatar", "created_at", "updated_at")
+            ),
+            "teams": Collection("Team", ("name", "created_at", "updated_at")),
+            "team_positions": Collection(
+                "TeamPosition",
+                ("created_at", "updated_at"),
+                {"team": "Team", "person": "Person"},
+            ),
+            "field_definitions": Collection(
+                "FieldDefinition", ("name", "data_type", "created_at", "updated_at")
+            ),
+            "field_data": Collection(
+                "FieldDatum",
+                ("value", "created_at", "updated_at"),
+                {"customizable": "Person", "field_definition": "FieldDefinition"},
+            ),
+        }
+        self.by_type = {c.type: c for c in self.collections.values()}
+        self._next_id = 1000000
+
+    def next_id(self) -> str:
+        self._next_id += 1
+        return str(self._next_id)
+
+    def avatar(self, person_id: str) -> str:
+        return f"{self.base_url}/avatars/{person_id}.svg"
+
+    def add_person(self, created: datetime, now: datetime) -> str:
+        rng = self.random
+        person_id = self.next_id()
+        updated = created + (now - created) * rng.random()
+        self.collections["people"].add(
+            [
+                person_id,
+                f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "active" if rng.random() < 0.92 else "inactive",
+                self.avatar(person_id),
+                _timestamp(created),
+                _timestamp(updated),
+            ]
+        )
+        return person_id
+
+    def churn(self, updates: int, additions: int) -> dict[str, int]:
+        """Rename or (de)activate ``updates`` random people and add new ones.
+
+        Every touched record gets a fresh ``updated_at``, so delta syncs can be
+        exercised against a changing org.
+        """
+        rng = self.random
+        now = datetime.now(timezone.utc)
+        people = self.collections["people"]
+        columns = people.columns
+        for record in rng.sample(people.records, min(updates, len(people))):
+            if rng.random() < 0.2:
+                status = record[columns["status"]]
+                record[columns["status"]] = (
+                    "inactive" if status == "active" else "active"
+                )
+            else:
+                record[columns["name"]] = (
+                    f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+                )
+            record[columns["updated_at"]] = _timestamp(now)
+        for _ in range(additions):
+            self.add_person(now, now)
+        people.changed()
+        return {"updated": min(updates, len(people)), "added": additions}
+
+
+def generate_org(
+    people: int = 1000,
+    seed: int = 0,
+    base_url: str = "http://localhost:8001",
+    now: datetime | None = None,
+) -> SyntheticOrg:
+    """Generate an organization with ``people`` people, reproducibly from ``seed``.
+
+    Join dates skew towards ``now`` over ``HISTORY_YEARS`` years; about
+    ``POSITIONS_PER_PERSON`` team positions exist per person and each person
+    has a value for each field definition with probability ``FIELD_DATUM_RATE``.
+    """
+    org = SyntheticOrg(str(100000 + seed), f"Synthetic Church {seed}", seed, base_url)
+    rng = org.random
+    now = (now or datetime.now(timezone.utc)).replace(microsecond=0)
+    start = now - timedelta(days=365 * HISTORY_YEARS)
+    history = now - start
+    person_ids = [
+        org.add_person(start + history * rng.random() ** 0.5, now)
+        for _ in range(people)
+    ]
+    collections = org.collections
+    team_ids = []
+    for i in range(max(5, people // PEOPLE_PER_TEAM)):
+        team_id = org.next_id()
+        team_ids.append(team_id)
+        created = _timestamp(start + history * rng.random())
+        ministry = MINISTRIES[i % len(MINISTRIES)]
+        collections["teams"].records.append(
+            [team_id, f"{ministry} {i // len(MINISTRIES) + 1}", created, created]
+        )
+    for _ in range(int(people * POSITIONS_PER_PERSON)):
+        created = _timestamp(start + history * rng.random())
+        person_id = rng.choice(person_ids) if rng.random() < 0.85 else ""
+        collections["team_positions"].records.append(
+            [org.next_id(), created, created, rng.choice(team_ids), person_id]
+        )
+    created = _timestamp(start)
+    definitions = []
+    for name, choices in FIELD_DEFINITIONS:
+        definition_id = org.next_id()
+        definitions.append((definition_id, choices))
+        collections["field_definitions"].records.append(
+            [definition_id, name, "select", created, created]
+        )
+    field_data = collections["field_data"].records
+    for person_id in person_ids:
+        for definition_id, choices in definitions:
+            if rng.random() < FIELD_DATUM_RATE:
+                updated = _timestamp(start + history * rng.random())
+                field_data.append(
+                    [
+                        org.next_id(),
+                        rng.choice(choices),
+                        updated,
+                        updated,
+                        person_id,
+                        definition_id,
+                    ]
+                )
+    for collection in collections.values():
+        collection.changed()
+    return org
@@ -0,0 +1,271 @@
+import asyncio
+import hashlib
+import json
+import random
+import re
+import secrets
+import time
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, RedirectResponse, Response
+from starlette.routing import Route
+from pco_simulator.generator import Collection, SyntheticOrg
+
+DEFAULT_PER_PAGE = 25
+MAX_PER_PAGE = 100
+WHERE_RE = re.compile(r"^where\[(\w+)\](?:\[(gt|gte|lt|lte)\])?$")
+FIELDS_RE = re.compile(r"^fields\[(\w+)\]$")
+
+
+def _error(status: int, title: str, detail: str = "") -> JSONResponse:
+    return JSONResponse(
+        {"errors": [{"status": str(status), "title": title, "detail": detail}]},
+        status_code=status,
+    )
+
+
+class RateLimiter:
+    """Per-token fixed-window request counter reporting Planning Center's headers."""
+
+    def __init__(self, limit: int, period: float):
+        self.limit = limit
+        self.period = period
+        self.windows: dict[str, tuple[float, int]] = {}
+
+    def hit(self, token: str) -> tuple[dict[str, str], float]:
+        """Count a request for a token.
+
+        Returns the rate-limit headers and, when over the limit, the seconds
+        until the window resets (otherwise 0).
+        """
+        now = time.monotonic()
+        started, count = self.windows.get(token, (now, 0))
+        if now - started >= self.period:
+            started, count = now, 0
+        count += 1
+        self.windows[token] = (started, count)
+        headers = {
+            "X-PCO-API-Request-Rate-Limit": str(self.limit),
+            "X-PCO-API-Request-Rate-Period": str(int(self.period)),
+            "X-PCO-API-Request-Rate-Count": str(count),
+        }
+        if self.limit and count > self.limit:
+            return headers, self.period - (now - started)
+        return headers, 0.0
+
+
+class Simulator:
+    """Serves a ``SyntheticOrg`` through the Planning Center endpoints the app uses.
+
+    Any bearer token is accepted. Collections support ``per_page``/``offset``
+    pagination with ``links.next`` and ``meta.total_count``, ``where[attr]``
+    and ``where[attr][gt|gte|lt|lte]`` filters, ``fields[Type]`` sparse
+    fieldsets, ``include=`` of related records and ``ETag``/``If-None-Match``.
+    """
+
+    def __init__(
+        self,
+        org: SyntheticOrg,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit: int = 100,
+        rate_period: float = 20.0,
+    ):
+        self.org = org
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limiter = RateLimiter(rate_limit, rate_period)
+        self.requests = 0
+        self.bytes_sent = 0
+        self.throttled = 0
+
+    async def _delay(self):
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _respond(
+        self, request: Request, body: dict, headers: dict[str, str]
+    ) -> Response:
+        content = json.dumps(body, separators=(",", ":")).encode()
+        etag = f'"{hashlib.sha1(content).hexdigest()}"'
+        headers = {**headers, "ETag": etag}
+        if request.headers.get("If-None-Match") == etag:
+            return Response(status_code=304, headers=headers)
+        self.bytes_sent += len(content)
+        return Response(content, media_type="application/vnd.api+json", headers=headers)
+
+    async def _guard(self, request: Request) -> tuple[dict[str, str], Response | None]:
+        """Simulate latency, check the bearer token and apply the rate limit."""
+        await self._delay()
+        self.requests += 1
+        authorization = request.headers.get("Authorization", "")
+        token = authorization.removeprefix("Bearer ").strip()
+        if not token:
+            return {}, _error(401, "Unauthorized", "Missing bearer token")
+        headers, retry_after = self.rate_limiter.hit(token)
+        if retry_after:
+            self.throttled += 1
+            response = _error(429, "Too Many Requests")
+            response.headers.update(
+                {**headers, "Retry-After": str(max(1, round(retry_after)))}
+            )
+            return headers, response
+        return headers, None
+
+    async def organization(self, request: Request) -> Response:
+        headers, denied = await self._guard(request)
+        if denied is not None:
+            return denied
+        body = {
+            "data": {
+                "type": "Organization",
+                "id": self.org.id,
+                "attributes": {"name": self.org.name},
+            }
+        }
+        return self._respond(request, body, headers)
+
+    async def collection(self, request: Request) -> Response:
+        headers, denied = await self._guard(request)
+        if denied is not None:
+            return denied
+        name = request.path_params["collection"]
+        collection = self.org.collections.get(name)
+        if collection is None:
+            return _error(404, "Not Found", f"Unknown collection {name}")
+        where = []
+        fields: dict[str, set[str]] = {}
+        for key, value in request.query_params.items():
+            if match := WHERE_RE.match(key):
+                where.append((match.group(1), match.group(2) or "eq", value))
+            elif match := FIELDS_RE.match(key):
+                fields[match.group(1)] = set(filter(None, value.split(",")))
+        try:
+            per_page = int(request.query_params.get("per_page", DEFAULT_PER_PAGE))
+            per_page = min(MAX_PER_PAGE, max(1, per_page))
+            offset = max(0, int(request.query_params.get("offset", 0)))
+            positions = collection.select(where)
+        except ValueError:
+            return _error(400, "Bad Request", "per_page and offset must be integers")
+        except KeyError as e:
+            return _error(400, "Bad Request", f"Unsupported filter {e}")
+        records = collection.records
+        page = [records[i] for i in positions[offset : offset + per_page]]
+        body = {
+            "data": [
+                collection.resource(record, fields.get(collection.type))
+                for record in page
+            ],
+            "included": self._included(
+                collection, page, request.query_params.get("include", ""), fields
+            ),
+            "meta": {
+                "total_count": len(positions),
+                "count": len(page),
+                "parent": {"id": self.org.id, "type": "Organization"},
+            },
+            "links": {"self": str(request.url)},
+        }
+        next_offset = offset + per_page
+        if next_offset < len(positions):
+            body["links"]["next"] = str(
+                request.url.include_query_params(offset=next_offset)
+            )
+            body["meta"]["next"] = {"offset": next_offset}
+        return self._respond(request, body, headers)
+
+    def _included(
+        self,
+        collection: Collection,
+        page: list[list[str]],
+        include: str,
+        fields: dict[str, set[str]],
+    ) -> list[dict]:
+        included = {}
+        for name in filter(None, include.split(",")):
+            related_type = collection.relationships.get(name)
+            related = self.org.by_type.get(related_type)
+            if related is None:
+                continue
+            column = collection.columns[f"{name}_id"]
+            for record in page:
+                related_id = record[column]
+                if related_id and (related_type, related_id) not in included:
+                    related_record = related.find(related_id)
+                    if related_record is not None:
+                        included[(related_type, related_id)] = related.resource(
+                            related_record, fields.get(related_type)
+                        )
+        return list(included.values())
+
+    async def authorize(self, request: Request) -> Response:
+        """Approve every authorization request and redirect back with a code."""
+        redirect_uri = request.query_params.get("redirect_uri", "")
+        if not redirect_uri:
+            return _error(400, "Bad Request", "Missing redirect_uri")
+        return RedirectResponse(f"{redirect_uri}?code={secrets.token_hex(8)}")
+
+    async def token(self, request: Request) -> Response:
+        """Exchange any authorization code or refresh token for an access token."""
+        await self._delay()
+        return JSONResponse(
+            {
+                "access_token": secrets.token_hex(16),
+                "token_type": "bearer",
+                "expires_in": 7200,
+                "refresh_token": secrets.token_hex(16),
+                "scope": "people services",
+                "created_at": int(time.time()),
+            }
+        )
+
+    async def avatar(self, request: Request) -> Response:
+        """Serve a small SVG avatar with the person's id as its label."""
+        person_id = request.path_params["person_id"]
+        hue = int(person_id) % 360 if person_id.isdigit() else 0
+        svg = (
+            '<svg xmlns="http://www.w3.org/2000/svg" width="256" height="256">'
+            f'<circle cx="128" cy="128" r="128" fill="hsl({hue},60%,55%)"/>'
+            '<text x="128" y="140" font-size="40" text-anchor="middle" fill="#fff">'
+            f"{person_id[-3:]}</text></svg>"
+        )
+        return Response(svg, media_type="image/svg+xml")
+
+    async def churn(self, request: Request) -> Response:
+        """Update and add people so delta syncs have something to pick up."""
+        try:
+            updates = int(request.query_params.get("updates", 100))
+            additions = int(request.query_params.get("additions", 10))
+        except ValueError:
+            return _error(400, "Bad Request", "updates and additions must be integers")
+        return JSONResponse(self.org.churn(updates, additions))
+
+    async def stats(self, request: Request) -> Response:
+        """Report what the simulator has served, for benchmarks to read."""
+        return JSONResponse(
+            {
+                "requests": self.requests,
+                "bytes_sent": self.bytes_sent,
+                "throttled": self.throttled,
+                "collections": {
+                    name: len(collection)
+                    for name, collection in self.org.collections.items()
+                },
+            }
+        )
+
+
+def create_app(simulator: Simulator) -> Starlette:
+    """Return the ASGI app serving a simulator."""
+    return Starlette(
+        routes=[
+            Route("/oauth/authorize", simulator.authorize),
+            Route("/oauth/token", simulator.token, methods=["POST"]),
+            Route("/people/v2", simulator.organization),
+            Route("/people/v2/{collection}", simulator.collection),
+            Route("/avatars/{person_id}.svg", simulator.avatar),
+            Route("/_simulator/churn", simulator.churn, methods=["POST"]),
+            Route("/_simulator/stats", simulator.stats),
+        ]
+    )
@@ -0,0 +1,103 @@
+import random
+from app.data.aggregates import TeamCounts
+
+TEAMS = {"t1": "Greeters", "t2": "Worship", "t3": "Parking"}
+
+
+def _rebuilt(counts: TeamCounts) -> TeamCounts:
+    fresh = TeamCounts()
+    fresh.rebuild(
+        counts.active_people,
+        counts.team_names,
+        [(position_id, *held) for position_id, held in counts.positions.items()],
+    )
+    return fresh
+
+
+def _by_name(composition: list[dict]) -> dict[str, int]:
+    return {row["name"]: row["value"] for row in composition}
+
+
+def _counts() -> TeamCounts:
+    counts = TeamCounts()
+    counts.rebuild(
+        ["p1", "p2", "p3"],
+        TEAMS,
+        [
+            ("a", "t1", "p1"),
+            ("b", "t1", "p2"),
+            ("c", "t2", "p1"),
+            ("d", "t2", "p4"),
+            ("e", "t3", ""),
+        ],
+    )
+    return counts
+
+
+def test_only_active_people_are_counted():
+    assert _counts().composition() == [
+        {"name": "Greeters", "value": 2},
+        {"name": "Worship", "value": 1},
+    ]
+
+
+def test_set_person_toggles_their_positions():
+    counts = _counts()
+    counts.set_person("p4", True)
+    counts.set_person("p1", False)
+    counts.set_person("p1", False)
+    assert _by_name(counts.composition()) == {"Greeters": 1, "Worship": 1}
+    counts.set_person("p1", True)
+    assert _by_name(counts.composition()) == {"Greeters": 2, "Worship": 2}
+
+
+def test_positions_move_and_are_removed():
+    counts = _counts()
+    counts.set_position("a", {"team_id": "t3", "person_id": "p1"})
+    counts.set_position("b", None)
+    counts.set_position("e", {"team_id": "t3", "person_id": "p3"})
+    assert counts.composition() == [
+        {"name": "Parking", "value": 2},
+        {"name": "Worship", "value": 1},
+    ]
+    assert counts.team_ids_for("p1") == ["t2", "t3"]
+    assert counts.team_ids_for("p2") == []
+
+
+def test_removed_team_is_hidden_until_renamed():
+    counts = _counts()
+    counts.set_team("t1", None)
+    assert counts.composition() == [{"name": "Worship", "value": 1}]
+    counts.set_team("t1", "Hospitality")
+    assert counts.composition()[0] == {"name": "Hospitality", "value": 2}
+
+
+def test_teams_sharing_a_name_are_combined():
+    counts = _counts()
+    counts.set_team("t2", "Greeters")
+    assert counts.composition() == [{"name": "Greeters", "value": 3}]
+
+
+def test_incremental_updates_match_rebuild():
+    rng = random.Random(0)
+    people = [f"p{i}" for i in range(20)]
+    counts = TeamCounts()
+    counts.rebuild(people[:10], TEAMS, [])
+    for _ in range(500):
+        change = rng.random()
+        if change < 0.3:
+            counts.set_person(rng.choice(people), rng.random() < 0.5)
+        elif change < 0.4:
+            team_id = rng.choice(list(TEAMS))
+            counts.set_team(team_id, rng.choice([None, TEAMS[team_id]]))
+        elif change < 0.8:
+            counts.set_position(
+                f"pos{rng.randrange(30)}",
+                {"team_id": rng.choice(list(TEAMS)), "person_id": rng.choice(people)},
+            )
+        else:
+            counts.set_position(f"pos{rng.randrange(30)}", None)
+        composition = counts.composition()
+        values = [row["value"] for row in composition]
+        assert values == sorted(values, reverse=True)
+        assert _by_name(composition) == _by_name(_rebuilt(counts).composition())
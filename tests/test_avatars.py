@@ -0,0 +1,139 @@
+import asyncio
+import io
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import httpx
+import pytest
+from PIL import Image
+from app.api import avatars
+from app.api.avatars import AvatarCache, AvatarError
+from app.api.routes import api
+
+SVG = b'<svg xmlns="http://www.w3.org/2000/svg"><script>alert(1)</script></svg>'
+
+
+def _png(size: int) -> bytes:
+    output = io.BytesIO()
+    Image.new("RGB", (size, size), "red").save(output, format="PNG")
+    return output.getvalue()
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+    """Serves the bodies the avatar cache must accept or reject."""
+
+    requests: list[tuple[str, str]] = []
+    routes = {
+        "/photo.png": ("image/png", _png(256)),
+        "/avatar.svg": ("image/svg+xml", SVG),
+        "/page.html": ("text/html", b"<script>alert(1)</script>"),
+        "/fake.png": ("image/png", b"not really a png"),
+        "/large.png": ("image/png", b"\0" * 4096),
+    }
+
+    def do_GET(self):
+        self.requests.append((self.headers["Host"].split(":")[0], self.path))
+        port = self.server.server_address[1]
+        redirects = {
+            "/redirect": f"http://localhost:{port}/photo.png",
+            "/moved.png": "/photo.png",
+            "/loop.png": "/loop.png",
+        }
+        if self.path in redirects:
+            self.send_response(302)
+            self.send_header("Location", redirects[self.path])
+            self.end_headers()
+            return
+        media_type, body = self.routes[self.path.split("?")[0]]
+        self.send_response(200)
+        self.send_header("Content-Type", media_type)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ImageHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(avatars, "AVATAR_HOSTS", ("127.0.0.1",))
+    monkeypatch.setattr(avatars, "AVATAR_MAX_BYTES", 2048)
+    cache = AvatarCache(str(tmp_path))
+    monkeypatch.setattr(avatars, "_cache", cache)
+    yield cache
+    asyncio.run(cache.aclose())
+
+
+def test_photo_is_resized_to_webp(cache, server_url):
+    thumbnail = asyncio.run(cache.get(f"{server_url}/photo.png"))
+    assert thumbnail.media_type == "image/webp"
+    with Image.open(thumbnail.path) as image:
+        assert image.size == (avatars.AVATAR_SIZE, avatars.AVATAR_SIZE)
+
+
+@pytest.mark.parametrize(
+    "path", ["/page.html", "/fake.png", "/large.png", "/redirect", "/loop.png"]
+)
+def test_unsafe_avatars_are_rejected(cache, server_url, path):
+    with pytest.raises(AvatarError):
+        asyncio.run(cache.get(f"{server_url}{path}"))
+
+
+def test_off_host_redirect_is_never_requested(cache, server_url):
+    ImageHandler.requests.clear()
+    with pytest.raises(AvatarError):
+        asyncio.run(cache.get(f"{server_url}/redirect"))
+    assert ImageHandler.requests == [("127.0.0.1", "/redirect")]
+
+
+def test_on_host_redirect_is_followed(cache, server_url):
+    thumbnail = asyncio.run(cache.get(f"{server_url}/moved.png"))
+    assert thumbnail.media_type == "image/webp"
+
+
+def test_cache_directory_is_bounded(cache, server_url):
+    cache.max_bytes = 4096
+
+    async def fetch_variants():
+        for version in range(50):
+            await cache.get(f"{server_url}/avatar.svg?v={version}")
+
+    asyncio.run(fetch_variants())
+    assert cache.size <= cache.max_bytes
+    assert sum(size for _, _, size in cache._files()) == cache.size
+
+
+def test_decompression_bomb_is_rejected(cache, server_url, monkeypatch):
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 10)
+    with pytest.raises(AvatarError):
+        asyncio.run(cache.get(f"{server_url}/photo.png"))
+
+
+def test_svg_is_served_sandboxed(cache, server_url):
+    async def fetch() -> tuple[httpx.Response, httpx.Response]:
+        transport = httpx.ASGITransport(app=api)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://app"
+        ) as client:
+            svg = await client.get(
+                "/api/avatar", params={"url": f"{server_url}/avatar.svg"}
+            )
+            html = await client.get(
+                "/api/avatar", params={"url": f"{server_url}/page.html"}
+            )
+            return svg, html
+
+    svg, html = asyncio.run(fetch())
+    assert svg.status_code == 200
+    assert svg.headers["Content-Type"].startswith("image/svg+xml")
+    assert svg.headers["X-Content-Type-Options"] == "nosniff"
+    assert svg.headers["Content-Security-Policy"] == "default-src 'none'"
+    assert html.status_code == 502
@@ -0,0 +1,88 @@
+from app.data.columnar import (
+    CodedColumn,
+    ColumnTable,
+    FieldValues,
+    Interner,
+    TextColumn,
+)
+
+
+def _table() -> ColumnTable:
+    table = ColumnTable(
+        {"id": CodedColumn(Interner()), "name": TextColumn(), "status": CodedColumn()}
+    )
+    table.extend(
+        {"id": f"p{i}", "name": f"Person {i}", "status": "active"} for i in range(5)
+    )
+    return table
+
+
+def _active(item: dict) -> dict | None:
+    if item["status"] != "active":
+        return None
+    return {"id": item["id"], "name": item["name"], "status": item["status"]}
+
+
+def test_merged_updates_appends_and_removes():
+    table = _table()
+    merged = table.merged(
+        [
+            {"id": "p1", "name": "Renamed", "status": "active"},
+            {"id": "p3", "name": "Person 3", "status": "inactive"},
+            {"id": "p9", "name": "Person 9", "status": "active"},
+            {"id": "p8", "name": "Person 8", "status": "inactive"},
+        ],
+        _active,
+    )
+    assert merged.column("id") == ["p0", "p1", "p2", "p4", "p9"]
+    assert merged.column("name")[1] == "Renamed"
+    positions = {row_id: merged.position(row_id) for row_id in ("p3", "p4", "p8")}
+    assert positions == {"p3": None, "p4": 3, "p8": None}
+    assert merged[merged.position("p4")]["name"] == "Person 4"
+
+
+def test_merged_leaves_the_original_unchanged():
+    table = _table()
+    before = list(table)
+    table.merged(
+        [
+            {"id": "p0", "name": "Renamed", "status": "active"},
+            {"id": "p2", "name": "Person 2", "status": "inactive"},
+            {"id": "p7", "name": "Person 7", "status": "active"},
+        ],
+        _active,
+    )
+    assert list(table) == before
+    assert table.position("p2") == 2
+    assert table.position("p7") is None
+
+
+def test_merged_applies_the_last_change_to_a_row():
+    merged = _table().merged(
+        [
+            {"id": "p1", "name": "First", "status": "active"},
+            {"id": "p1", "name": "Second", "status": "active"},
+        ],
+        _active,
+    )
+    assert len(merged) == 5
+    assert merged[1]["name"] == "Second"
+
+
+def test_field_values_count_and_for_person():
+    people = Interner()
+    values = FieldValues(people)
+    values.set("p1", "shirt", "M")
+    values.set("p3", "shirt", "L")
+    values.set("p3", "diet", "Vegan")
+    values.set("p3", "shirt", "XL")
+    assert values.count("shirt") == 2
+    assert values.count("diet") == 1
+    assert values.count("missing") == 0
+    assert len(values) == 3
+    assert values.for_person("p3") == {"shirt": "XL", "diet": "Vegan"}
+    assert values.for_person("p1") == {"shirt": "M"}
+    assert values.for_person("p2") == {}
+    values.clear()
+    assert len(values) == 0
+    assert values.for_person("p3") == {}
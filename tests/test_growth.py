@@ -0,0 +1,61 @@
+from datetime import date
+import pytest
+from app.data.growth import GrowthSeries
+
+JOINED = [
+    "2024-03-01T09:00:00Z",
+    "2024-01-30T10:00:00Z",
+    "2024-02-07T00:00:00Z",
+    "",
+    "2024-02-05T23:59:59Z",
+]
+
+
+def test_month_bins_are_cumulative():
+    assert GrowthSeries(JOINED).series() == [
+        {"name": "2024-01", "uv": 1, "pv": 1},
+        {"name": "2024-02", "uv": 2, "pv": 3},
+        {"name": "2024-03", "uv": 1, "pv": 4},
+    ]
+
+
+def test_week_bins_are_labelled_by_monday():
+    rows = GrowthSeries(JOINED).series("week")
+    assert [row["name"] for row in rows] == [
+        "2024-01-29",
+        "2024-02-05",
+        "2024-02-12",
+        "2024-02-19",
+        "2024-02-26",
+    ]
+    assert [row["uv"] for row in rows] == [1, 2, 0, 0, 1]
+    assert rows[-1]["pv"] == 4
+
+
+def test_day_bins_cover_the_range_and_count_earlier_joins():
+    rows = GrowthSeries(JOINED).series("day", date(2024, 2, 4), date(2024, 2, 7))
+    assert rows == [
+        {"name": "2024-02-04", "uv": 0, "pv": 1},
+        {"name": "2024-02-05", "uv": 1, "pv": 2},
+        {"name": "2024-02-06", "uv": 0, "pv": 2},
+        {"name": "2024-02-07", "uv": 1, "pv": 3},
+    ]
+
+
+def test_range_excludes_joins_outside_it():
+    rows = GrowthSeries(JOINED).series("week", date(2024, 2, 1), date(2024, 2, 12))
+    assert rows == [
+        {"name": "2024-01-29", "uv": 0, "pv": 1},
+        {"name": "2024-02-05", "uv": 2, "pv": 3},
+        {"name": "2024-02-12", "uv": 0, "pv": 3},
+    ]
+
+
+def test_empty_series_and_ranges():
+    assert GrowthSeries([]).series("day") == []
+    assert GrowthSeries(JOINED).series("day", date(2024, 2, 2), date(2024, 2, 1)) == []
+
+
+def test_unknown_granularity():
+    with pytest.raises(ValueError):
+        GrowthSeries(JOINED).series("year")
@@ -0,0 +1,57 @@
+from app.data.search import SearchIndex
+
+
+def _index() -> SearchIndex:
+    index = SearchIndex()
+    index.add("p1", "Ana María O'Neil", ["Worship", "Size: M"])
+    index.add("p2", "Anders Olsen", ["Parking lot"])
+    index.add("p3", "Beth Anderson", ["worship leader"])
+    return index
+
+
+def test_names_match_by_word_prefix():
+    index = _index()
+    assert index.search("an") == {"p1", "p2", "p3"}
+    assert index.search("AND") == {"p2", "p3"}
+    assert index.search("ols") == {"p2"}
+    assert index.search("lsen") == set()
+
+
+def test_field_values_match_whole_words():
+    index = _index()
+    assert index.search("worship") == {"p1", "p3"}
+    assert index.search("wor") == set()
+    assert index.search("lot") == {"p2"}
+
+
+def test_every_query_word_must_match():
+    index = _index()
+    assert index.search("an worship") == {"p1", "p3"}
+    assert index.search("beth parking") == set()
+    assert index.search("ana worship size m") == {"p1"}
+
+
+def test_punctuation_is_ignored():
+    index = _index()
+    assert index.search("o'neil") == {"p1"}
+    assert index.search("oneil") == set()
+    assert index.search("size:") == {"p1"}
+    assert index.search("maría") == {"p1"}
+
+
+def test_empty_query_returns_everyone():
+    index = _index()
+    assert index.search("") == {"p1", "p2", "p3"}
+    assert index.search("  ,. ") == {"p1", "p2", "p3"}
+
+
+def test_add_replaces_and_remove_drops():
+    index = _index()
+    index.add("p2", "Anders Olsen", ["Greeters"])
+    assert index.search("parking") == set()
+    assert index.search("greeters") == {"p2"}
+    index.remove("p3")
+    index.remove("missing")
+    assert len(index) == 2
+    assert index.search("worship") == {"p1"}
+    assert index.search("beth") == set()
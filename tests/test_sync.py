@@ -0,0 +1,128 @@
+import asyncio
+import httpx
+import pytest
+from app.api import sync
+from app.data import dataset, store
+from app.data.dataset import OrgDataset
+from app.data.store import SnapshotStore
+from pco_simulator.generator import generate_org
+from pco_simulator.server import Simulator, create_app
+
+BASE_URL = "http://simulator"
+
+
+@pytest.fixture
+def org(tmp_path, monkeypatch):
+    monkeypatch.setattr(dataset, "API_BASE_URL", BASE_URL)
+    monkeypatch.setattr(store, "_store", SnapshotStore(str(tmp_path / "snapshot.db")))
+    return generate_org(300, seed=1, base_url=BASE_URL)
+
+
+def _client(org) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=create_app(Simulator(org, rate_limit=0))),
+        base_url=BASE_URL,
+        headers={"Authorization": "Bearer test"},
+    )
+
+
+def _people(org_dataset: OrgDataset) -> list[dict]:
+    return sorted(org_dataset.people, key=lambda row: row["id"])
+
+
+def _active_ids(org) -> set[str]:
+    people = org.collections["people"]
+    status = people.columns["status"]
+    return {record[0] for record in people.records if record[status] == "active"}
+
+
+def _remove(org, collection: str, record_id: str):
+    records = org.collections[collection]
+    records.records[:] = [r for r in records.records if r[0] != record_id]
+    records.changed()
+
+
+def test_delta_sync_matches_full_sync(org):
+    async def run() -> tuple[bool, OrgDataset, OrgDataset]:
+        async with _client(org) as client:
+            synced = OrgDataset(org.id)
+            await synced.sync(client, "people")
+            org.churn(updates=40, additions=5)
+            is_full = await synced.sync(client, "people")
+            fresh = OrgDataset(org.id)
+            await fresh.sync(client, "people")
+            return is_full, synced, fresh
+
+    is_full, synced, fresh = asyncio.run(run())
+    assert not is_full
+    assert set(synced.people.column("id")) == _active_ids(org)
+    assert _people(synced) == _people(fresh)
+
+
+def test_deletion_check_falls_back_to_full_sync(org, monkeypatch):
+    async def run(removed_id: str) -> tuple[bool, OrgDataset]:
+        async with _client(org) as client:
+            synced = OrgDataset(org.id)
+            await synced.sync(client, "people")
+            _remove(org, "people", removed_id)
+            return await synced.sync(client, "people"), synced
+
+    monkeypatch.setattr(sync, "DELETION_CHECK_INTERVAL", 0)
+    removed_id = min(_active_ids(org))
+    is_full, synced = asyncio.run(run(removed_id))
+    assert is_full
+    assert synced.people.position(removed_id) is None
+    assert set(synced.people.column("id")) == _active_ids(org)
+
+
+def test_deletions_wait_for_the_deletion_check(org):
+    async def run(removed_id: str) -> tuple[bool, OrgDataset]:
+        async with _client(org) as client:
+            synced = OrgDataset(org.id)
+            await synced.sync(client, "people")
+            _remove(org, "people", removed_id)
+            return await synced.sync(client, "people"), synced
+
+    removed_id = min(_active_ids(org))
+    is_full, synced = asyncio.run(run(removed_id))
+    assert not is_full
+    assert synced.people.position(removed_id) is not None
+
+
+def test_full_sync_after_interval(org, monkeypatch):
+    async def run() -> bool:
+        async with _client(org) as client:
+            synced = OrgDataset(org.id)
+            await synced.sync(client, "people")
+            return await synced.sync(client, "people")
+
+    monkeypatch.setattr(sync, "FULL_SYNC_INTERVAL", 0)
+    assert asyncio.run(run())
+
+
+def test_deleted_field_data_is_removed_at_the_deletion_check(org, monkeypatch):
+    field_data = org.collections["field_data"]
+    columns = field_data.columns
+    active = _active_ids(org)
+    removed = next(
+        record
+        for record in field_data.records
+        if record[columns["customizable_id"]] in active
+    )
+    person_id = removed[columns["customizable_id"]]
+    field_definition_id = removed[columns["field_definition_id"]]
+
+    async def run() -> OrgDataset:
+        async with _client(org) as client:
+            synced = OrgDataset(org.id)
+            await synced.sync(client, "people")
+            await synced.sync_field_data(client, [field_definition_id])
+            assert field_definition_id in synced.field_values.for_person(person_id)
+            _remove(org, "field_data", removed[0])
+            await synced.sync(client, "people")
+            await synced.sync_field_data(client, [field_definition_id])
+            return synced
+
+    monkeypatch.setattr(sync, "DELETION_CHECK_INTERVAL", 0)
+    synced = asyncio.run(run())
+    assert field_definition_id not in synced.field_values.for_person(person_id)